@@ -0,0 +1,827 @@
+#!/usr/bin/env python3
+"""
+Fake Chrome DevTools endpoint for wsl-chrome-mcp.py
+Test double used by the test suite and the bench/fake-cdp commands; the
+debugger itself never imports it.
+"""
+
+import base64
+import importlib.util
+import itertools
+import json
+import os
+import random
+import socket
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# The debugger is a script with a hyphenated name: reuse the copy that is running, else load it by path
+if "wsl_chrome_mcp" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "wsl_chrome_mcp", os.path.join(os.path.dirname(os.path.abspath(__file__)), "wsl-chrome-mcp.py"))
+    sys.modules["wsl_chrome_mcp"] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules["wsl_chrome_mcp"])
+
+from wsl_chrome_mcp import (
+    DOCUMENT_LOADED_SCRIPT, HELPER_HANDLE_EXPRESSION, HELPER_INVOKE_FUNCTION, HELPER_RUNTIME_SCRIPT,
+    TIME_ORIGIN_EXPRESSION, WS_OP_CLOSE, WS_OP_PING, WS_OP_PONG, WS_OP_TEXT, CDPConnectionError,
+    _encode_ws_frame, _read_ws_frame, _ws_accept_key
+)
+
+# 1x1 transparent PNG returned by the fake Page.captureScreenshot
+FAKE_SCREENSHOT_PNG = base64.b64encode(
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+).decode()
+
+class _FakeCDPHandler(socketserver.StreamRequestHandler):
+    """One client connection to a FakeCDPServer: HTTP requests, then maybe a WebSocket"""
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.write_lock = threading.Lock()
+        self.target_id: Optional[str] = None  # Page socket's target; None for the browser socket
+        self.sessions: Dict[str, str] = {}  # Flattened session id -> target id
+        self.discover = False
+
+    def handle(self):
+        fake = self.server.fake
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                header = self.rfile.readline().decode("latin-1")
+                if header in ("\r\n", "\n", ""):
+                    break
+                name, _, value = header.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if "sec-websocket-key" in headers:
+                self.wfile.write((
+                    "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {_ws_accept_key(headers['sec-websocket-key'])}\r\n\r\n"
+                ).encode())
+                return self.serve_websocket(path)
+            length = int(headers.get("content-length", 0))
+            if length:
+                self.rfile.read(length)
+            status, body = fake.http(method, path)
+            payload = (body if isinstance(body, str) else json.dumps(body)).encode()
+            self.wfile.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                             f"Content-Type: application/json; charset=UTF-8\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+
+    def serve_websocket(self, path: str):
+        fake = self.server.fake
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[1] == "page":
+            if parts[2] not in fake.targets:
+                return
+            self.target_id = parts[2]
+        with fake._lock:
+            fake._clients.append(self)
+        try:
+            message = b""
+            while True:
+                fin, opcode, payload = _read_ws_frame(self.rfile)
+                if opcode == WS_OP_CLOSE:
+                    self.send_frame(b"", WS_OP_CLOSE)
+                    return
+                if opcode == WS_OP_PING:
+                    self.send_frame(payload, WS_OP_PONG)
+                    continue
+                message += payload
+                if not fin:
+                    continue
+                request, message = json.loads(message), b""
+                # Replies can overtake each other, like Chrome answering a slow awaitPromise later
+                threading.Thread(target=fake._answer, args=(self, request), daemon=True).start()
+        except (CDPConnectionError, OSError, ValueError):
+            return
+        finally:
+            with fake._lock:
+                if self in fake._clients:
+                    fake._clients.remove(self)
+
+    def send_frame(self, payload: bytes, opcode: int = WS_OP_TEXT):
+        with self.write_lock:
+            self.wfile.write(_encode_ws_frame(payload, opcode, mask=False))
+
+    def send(self, message: Dict):
+        try:
+            self.send_frame(json.dumps(message).encode())
+        except OSError:
+            pass
+
+class _FakeCDPTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class FakeCDPServer:
+    """Stand-in for Chrome's DevTools endpoint, for hermetic tests and transport benchmarks
+
+    Serves /json, /json/list, /json/version, /json/new, /json/close and
+    /json/activate over keep-alive HTTP, and page and browser WebSockets with
+    flattened Target sessions. Built-in handlers cover the protocol side:
+    Page.navigate (emitting the lifecycle events of a load after
+    ``load_delay`` seconds), Page.captureScreenshot, the Target domain, calls
+    on the helper object (call_helper), Tracing (a synthetic main-thread
+    trace returned through IO.read), CPU profiles, JS/CSS coverage, heap
+    snapshots, memory counters and response bodies of ``navigation_requests``.
+    Page script is never interpreted: what Runtime.evaluate returns is
+    scripted with ``evaluate()`` (script_debugger_page() scripts what the
+    debugger needs), ``respond()`` scripts any other answer and ``emit()``
+    pushes events. The fake page leaks: heap, DOM nodes and detached divs
+    grow with every helper click/fill and snapshot (``leak_per_interaction``,
+    ``leaked_per_snapshot``). Every reply waits ``latency`` ± ``jitter``
+    seconds drawn from an RNG seeded with ``seed``, so runs are repeatable.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0, seed: int = 0,
+                 load_delay: float = 0.05, navigation_requests: Optional[List[Dict]] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.load_delay = load_delay
+        self.streams: Dict[str, bytes] = {}  # IO stream handle -> remaining data
+        self.leaked_per_snapshot = 10  # Detached DOM nodes each fake heap snapshot adds to the last
+        self.leak_per_interaction = 32 * 1024  # Heap bytes (and a detached div) each helper click/fill keeps
+        self._snapshots = 0
+        self._tracing: Dict[str, float] = {}  # Target id -> time Tracing.start was called
+        self._profiling: Dict[str, float] = {}  # Target id -> time Profiler.start was called
+        # Network traffic replayed on every navigation: {"url", "status", "type", "size", "failed"}
+        self.navigation_requests = navigation_requests or []
+        self.targets: "OrderedDict[str, Dict]" = OrderedDict()
+        self.calls: Dict[str, int] = defaultdict(int)  # Commands and HTTP endpoints served
+        self._handlers: Dict[str, List[Tuple[Callable[[Dict], bool], Any]]] = defaultdict(list)
+        self._clients: List[_FakeCDPHandler] = []
+        self._lock = threading.RLock()
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._server = _FakeCDPTCPServer(("127.0.0.1", port), _FakeCDPHandler)
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+        self.port = self._server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.browser_ws_url = f"ws://127.0.0.1:{self.port}/devtools/browser/{uuid.uuid4()}"
+
+    def __enter__(self) -> "FakeCDPServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self) -> "FakeCDPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-cdp", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            clients, self._clients = list(self._clients), []
+        for client in clients:
+            try:
+                client.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def evaluate(self, expression: Any, value: Any = None, error: Optional[str] = None):
+        """Script what the page returns for Runtime.evaluate (latest registration wins)
+
+        ``expression`` is the exact source or a predicate on it; ``value`` is
+        the returned value, or a callable taking (params, target_id) and
+        returning it. Scripted expressions also run when a new document
+        evaluates a matching addScriptToEvaluateOnNewDocument source.
+        """
+        matches = expression if callable(expression) else (lambda source: source == expression)
+        answer = value if callable(value) else (lambda params, target_id: value)
+        self.respond("Runtime.evaluate", lambda params, target_id: _fake_remote_object(answer(params, target_id)),
+                     when=lambda params: matches(params.get("expression", "")), error=error)
+
+    def respond(self, method: str, result: Any = None, when: Optional[Callable[[Dict], bool]] = None,
+                error: Optional[str] = None):
+        """Script the answer to ``method`` (latest registration wins)
+
+        ``result`` is the reply's result object, or a callable taking
+        (params, target_id) and returning it. ``when(params)`` limits the
+        override to matching commands, e.g. one Runtime.evaluate expression;
+        ``error`` answers with a protocol error instead. Helper runtime calls
+        are scripted as ``helper.<name>`` (helper.click, helper.waitFor...),
+        with ``result`` being the helper's return value.
+        """
+        if error is not None:
+            result = {"__error__": error}
+        with self._lock:
+            self._handlers[method].insert(0, (when or (lambda params: True), result))
+
+    def add_target(self, url: str = "about:blank", context_id: Optional[str] = None) -> Dict:
+        target_id = uuid.uuid4().hex[:16].upper()
+        target = {
+            "id": target_id,
+            "type": "page",
+            "title": url,
+            "url": url,
+            "browserContextId": context_id,
+            "helpers": False,  # Whether the current document has the helper runtime (see call_helper)
+            "frame_id": target_id,
+            "time_origin": time.time() * 1000,
+            "scripts": {},
+            "interactions": 0
+        }
+        with self._lock:
+            self.targets[target_id] = target
+            self.targets.move_to_end(target_id, last=False)
+        self._notify_discovery("Target.targetCreated", {"targetInfo": self._target_info(target)})
+        return target
+
+    def remove_target(self, target_id: str) -> bool:
+        with self._lock:
+            target = self.targets.pop(target_id, None)
+            clients = [client for client in self._clients if client.target_id == target_id]
+        if target is None:
+            return False
+        for client in clients:
+            try:
+                client.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._notify_discovery("Target.targetDestroyed", {"targetId": target_id})
+        return True
+
+    def emit(self, target_id: Optional[str], method: str, params: Dict):
+        """Send an event to every connection following a target (None: browser-level)"""
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            if target_id is None:
+                if client.target_id is None:
+                    client.send({"method": method, "params": params})
+                continue
+            if client.target_id == target_id:
+                client.send({"method": method, "params": params})
+            for session_id, attached in list(client.sessions.items()):
+                if attached == target_id:
+                    client.send({"method": method, "params": params, "sessionId": session_id})
+
+    def _notify_discovery(self, method: str, params: Dict):
+        with self._lock:
+            clients = [client for client in self._clients if client.discover]
+        for client in clients:
+            client.send({"method": method, "params": params})
+
+    def _delay(self):
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _page_json(self, target: Dict) -> Dict:
+        return {
+            "id": target["id"],
+            "type": target["type"],
+            "title": target["title"],
+            "url": target["url"],
+            "description": "",
+            "webSocketDebuggerUrl": f"ws://127.0.0.1:{self.port}/devtools/page/{target['id']}",
+            "devtoolsFrontendUrl": f"/devtools/inspector.html?ws=127.0.0.1:{self.port}/devtools/page/{target['id']}"
+        }
+
+    def _target_info(self, target: Dict) -> Dict:
+        return {
+            "targetId": target["id"],
+            "type": target["type"],
+            "title": target["title"],
+            "url": target["url"],
+            "attached": False,
+            "browserContextId": target["browserContextId"]
+        }
+
+    def http(self, method: str, path: str) -> Tuple[int, Any]:
+        """Answer a /json endpoint: (status, body)"""
+        self._delay()
+        path, _, query = path.partition("?")
+        parts = path.strip("/").split("/")
+        self.calls[f"HTTP /{'/'.join(parts[:2])}"] += 1
+        if path in ("/json", "/json/list"):
+            with self._lock:
+                return 200, [self._page_json(target) for target in self.targets.values()]
+        if path == "/json/version":
+            return 200, {
+                "Browser": "FakeChrome/1.0",
+                "Protocol-Version": "1.3",
+                "User-Agent": "FakeCDPServer",
+                "V8-Version": "0.0",
+                "webSocketDebuggerUrl": self.browser_ws_url
+            }
+        if path == "/json/new":
+            return 200, self._page_json(self.add_target(urllib.parse.unquote(query) or "about:blank"))
+        if len(parts) == 3 and parts[1] == "close":
+            return (200, "Target is closing") if self.remove_target(parts[2]) else (404, f"No such target id: {parts[2]}")
+        if len(parts) == 3 and parts[1] == "activate":
+            with self._lock:
+                if parts[2] not in self.targets:
+                    return 404, f"No such target id: {parts[2]}"
+                self.targets.move_to_end(parts[2], last=False)
+            return 200, "Target activated"
+        return 404, f"Unknown endpoint: {path}"
+
+    def _answer(self, client: _FakeCDPHandler, request: Dict):
+        method = request.get("method", "")
+        params = request.get("params") or {}
+        session_id = request.get("sessionId")
+        target_id = client.sessions.get(session_id) if session_id else client.target_id
+        self._delay()
+        self.calls[method] += 1
+
+        reply = {"id": request.get("id")}
+        if session_id:
+            reply["sessionId"] = session_id
+        try:
+            if session_id and target_id is None:
+                raise ValueError(f"Session with given id not found: {session_id}")
+            result = self._dispatch(client, target_id, method, params)
+            if isinstance(result, dict) and "__error__" in result:
+                raise ValueError(result["__error__"])
+            reply["result"] = result
+        except (KeyError, ValueError) as e:
+            reply["error"] = {"code": -32000, "message": str(e).strip("'")}
+        client.send(reply)
+
+    def _scripted(self, method: str, params: Dict, target_id: Optional[str]):
+        with self._lock:
+            handlers = list(self._handlers.get(method, ()))
+        for when, result in handlers:
+            if when(params):
+                return True, result(params, target_id) if callable(result) else result
+        return False, None
+
+    def _dispatch(self, client: _FakeCDPHandler, target_id: Optional[str], method: str, params: Dict) -> Any:
+        found, result = self._scripted(method, params, target_id)
+        if found:
+            return result
+        handler = getattr(self, "_cmd_" + method.replace(".", "_"), None)
+        if handler is not None:
+            return handler(client, target_id, params)
+        return {}
+
+    def _target(self, target_id: Optional[str]) -> Dict:
+        with self._lock:
+            if target_id not in self.targets:
+                raise ValueError(f"No target with given id found: {target_id}")
+            return self.targets[target_id]
+
+    # Browser and Target domains
+
+    def _cmd_Browser_getVersion(self, client, target_id, params):
+        return {"protocolVersion": "1.3", "product": "FakeChrome/1.0", "revision": "0",
+                "userAgent": "FakeCDPServer", "jsVersion": "0.0"}
+
+    def _cmd_Target_setDiscoverTargets(self, client, target_id, params):
+        client.discover = bool(params.get("discover"))
+        return {}
+
+    def _cmd_Target_getTargets(self, client, target_id, params):
+        with self._lock:
+            return {"targetInfos": [self._target_info(target) for target in self.targets.values()]}
+
+    def _cmd_Target_getTargetInfo(self, client, target_id, params):
+        return {"targetInfo": self._target_info(self._target(params.get("targetId", target_id)))}
+
+    def _cmd_Target_createTarget(self, client, target_id, params):
+        return {"targetId": self.add_target(params.get("url", "about:blank"), params.get("browserContextId"))["id"]}
+
+    def _cmd_Target_closeTarget(self, client, target_id, params):
+        return {"success": self.remove_target(params["targetId"])}
+
+    def _cmd_Target_activateTarget(self, client, target_id, params):
+        self._target(params["targetId"])
+        return {}
+
+    def _cmd_Target_attachToTarget(self, client, target_id, params):
+        self._target(params["targetId"])
+        session_id = uuid.uuid4().hex.upper()
+        client.sessions[session_id] = params["targetId"]
+        return {"sessionId": session_id}
+
+    def _cmd_Target_detachFromTarget(self, client, target_id, params):
+        client.sessions.pop(params.get("sessionId"), None)
+        return {}
+
+    def _cmd_Target_createBrowserContext(self, client, target_id, params):
+        return {"browserContextId": uuid.uuid4().hex.upper()}
+
+    def _cmd_Target_disposeBrowserContext(self, client, target_id, params):
+        with self._lock:
+            doomed = [t["id"] for t in self.targets.values() if t["browserContextId"] == params["browserContextId"]]
+        for doomed_id in doomed:
+            self.remove_target(doomed_id)
+        return {}
+
+    # Page domain
+
+    def _cmd_Page_getFrameTree(self, client, target_id, params):
+        target = self._target(target_id)
+        return {"frameTree": {"frame": {"id": target["frame_id"], "loaderId": "", "url": target["url"],
+                                        "securityOrigin": "", "mimeType": "text/html"}}}
+
+    def _cmd_Page_addScriptToEvaluateOnNewDocument(self, client, target_id, params):
+        target = self._target(target_id)
+        identifier = str(next(self._ids))
+        target["scripts"][identifier] = params.get("source", "")
+        return {"identifier": identifier}
+
+    def _cmd_Page_removeScriptToEvaluateOnNewDocument(self, client, target_id, params):
+        self._target(target_id)["scripts"].pop(params.get("identifier"), None)
+        return {}
+
+    def _cmd_Page_captureScreenshot(self, client, target_id, params):
+        self._target(target_id)
+        return {"data": FAKE_SCREENSHOT_PNG}
+
+    def _cmd_Page_navigate(self, client, target_id, params):
+        target = self._target(target_id)
+        loader_id = uuid.uuid4().hex.upper()
+        threading.Thread(target=self._load, args=(target, params["url"], loader_id), daemon=True).start()
+        return {"frameId": target["frame_id"], "loaderId": loader_id}
+
+    def _cmd_Page_reload(self, client, target_id, params):
+        target = self._target(target_id)
+        threading.Thread(target=self._load, args=(target, target["url"], uuid.uuid4().hex.upper()),
+                         daemon=True).start()
+        return {}
+
+    def _load(self, target: Dict, url: str, loader_id: str):
+        """Emit what Chrome sends for a main-frame navigation, with the page's network traffic"""
+        target_id, frame_id = target["id"], target["frame_id"]
+        self.emit(target_id, "Page.frameStartedLoading", {"frameId": frame_id})
+        now = time.time()
+        for index, request in enumerate(self.navigation_requests):
+            request_id = f"{loader_id}.{index}"
+            self.emit(target_id, "Network.requestWillBeSent", {
+                "requestId": request_id, "loaderId": loader_id, "timestamp": now, "wallTime": now,
+                "type": request.get("type", "XHR"),
+                "request": {"url": request["url"], "method": request.get("method", "GET"), "headers": {}}
+            })
+        time.sleep(self.load_delay)
+        if target_id not in self.targets:
+            return
+        target.update(url=url, title=url, helpers=False, time_origin=time.time() * 1000)
+        # Like Chrome, the new document runs the registered scripts (through scripted evaluate answers)
+        for source in list(target["scripts"].values()):
+            self._scripted("Runtime.evaluate", {"expression": source}, target_id)
+        self.emit(target_id, "Page.frameNavigated", {"frame": {"id": frame_id, "loaderId": loader_id, "url": url}})
+        self._notify_discovery("Target.targetInfoChanged", {"targetInfo": self._target_info(target)})
+        for index, request in enumerate(self.navigation_requests):
+            request_id = f"{loader_id}.{index}"
+            if request.get("failed"):
+                self.emit(target_id, "Network.loadingFailed", {
+                    "requestId": request_id, "timestamp": now + self.load_delay, "errorText": "net::ERR_FAILED"})
+                continue
+            self.emit(target_id, "Network.responseReceived", {
+                "requestId": request_id, "timestamp": now + self.load_delay, "type": request.get("type", "XHR"),
+                "response": {"url": request["url"], "status": request.get("status", 200), "headers": {},
+                             "mimeType": request.get("mimeType", "application/json"), "protocol": "http/1.1",
+                             "timing": {"requestTime": now, "dnsStart": -1, "dnsEnd": -1, "connectStart": -1,
+                                        "connectEnd": -1, "sslStart": -1, "sslEnd": -1, "sendStart": 0.5,
+                                        "sendEnd": 1.0, "receiveHeadersEnd": self.load_delay * 500}}
+            })
+            self.emit(target_id, "Network.loadingFinished", {
+                "requestId": request_id, "timestamp": now + self.load_delay,
+                "encodedDataLength": request.get("size", 1024)})
+        for name in ("init", "DOMContentLoaded", "load"):
+            self.emit(target_id, "Page.lifecycleEvent",
+                      {"frameId": frame_id, "loaderId": loader_id, "name": name, "timestamp": now})
+        self.emit(target_id, "Page.domContentEventFired", {"timestamp": now})
+        self.emit(target_id, "Page.loadEventFired", {"timestamp": now})
+        self.emit(target_id, "Page.lifecycleEvent",
+                  {"frameId": frame_id, "loaderId": loader_id, "name": "networkIdle", "timestamp": now})
+
+    def _cmd_Network_getResponseBody(self, client, target_id, params):
+        _, _, index = params["requestId"].rpartition(".")
+        if not index.isdigit() or int(index) >= len(self.navigation_requests):
+            raise ValueError("No resource with given identifier found")
+        request = self.navigation_requests[int(index)]
+        return {"body": request.get("body", json.dumps({"url": request["url"]})), "base64Encoded": False}
+
+    # Tracing and IO domains
+
+    def _cmd_Tracing_start(self, client, target_id, params):
+        if target_id in self._tracing:
+            raise ValueError("Tracing has already been started (possibly in another tab).")
+        self._tracing[target_id] = time.time()
+        return {}
+
+    def _cmd_Tracing_end(self, client, target_id, params):
+        started = self._tracing.pop(target_id, None)
+        if started is None:
+            raise ValueError("Tracing is not started")
+        handle = str(next(self._ids))
+        self.streams[handle] = json.dumps({"traceEvents": self._fake_trace_events(started, time.time())}).encode()
+        # Chrome reports completion after acknowledging Tracing.end
+        threading.Timer(0.01, self.emit, args=(target_id, "Tracing.tracingComplete",
+                                               {"dataLossOccurred": False, "stream": handle})).start()
+        return {}
+
+    def _fake_trace_events(self, started: float, ended: float) -> List[Dict]:
+        """Renderer main-thread timeline: a scripted task every 100ms, every fifth one long"""
+        pid, tid = 4242, 1
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": "CrRendererMain"}},
+                  {"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "Compositor"}}]
+        base = started * 1e6
+        for index in range(max(int((ended - started) * 10), 1)):
+            ts = base + index * 100000
+            duration = 80000 if index % 5 == 4 else 4000
+            events.append({"name": "RunTask", "cat": "toplevel", "ph": "X", "pid": pid, "tid": tid,
+                           "ts": ts, "dur": duration, "args": {}})
+            events.append({"name": "FunctionCall", "cat": "devtools.timeline", "ph": "X", "pid": pid, "tid": tid,
+                           "ts": ts + 100, "dur": duration * 0.7,
+                           "args": {"data": {"url": "http://fake/assets/index.js", "functionName": "render"}}})
+            events.append({"name": "UpdateLayoutTree", "cat": "devtools.timeline", "ph": "B", "pid": pid,
+                           "tid": tid, "ts": ts + duration * 0.75, "args": {}})
+            events.append({"name": "UpdateLayoutTree", "ph": "E", "pid": pid, "tid": tid, "ts": ts + duration * 0.85})
+            events.append({"name": "Layout", "cat": "devtools.timeline", "ph": "X", "pid": pid, "tid": tid,
+                           "ts": ts + duration * 0.85, "dur": duration * 0.1, "args": {}})
+            events.append({"name": "RunTask", "cat": "toplevel", "ph": "X", "pid": pid, "tid": 2,
+                           "ts": ts, "dur": 500, "args": {}})
+        return events
+
+    def _cmd_IO_read(self, client, target_id, params):
+        handle = params["handle"]
+        with self._lock:
+            if handle not in self.streams:
+                raise ValueError(f"Invalid stream handle: {handle}")
+            data = self.streams[handle]
+            chunk, self.streams[handle] = data[:params.get("size", 1 << 20)], data[params.get("size", 1 << 20):]
+        return {"data": chunk.decode("utf-8"), "eof": not self.streams[handle], "base64Encoded": False}
+
+    def _cmd_IO_close(self, client, target_id, params):
+        self.streams.pop(params["handle"], None)
+        return {}
+
+    # Profiler domain
+
+    def _cmd_Profiler_start(self, client, target_id, params):
+        self._target(target_id)
+        self._profiling[target_id] = time.time()
+        return {}
+
+    def _cmd_Profiler_stop(self, client, target_id, params):
+        started = self._profiling.pop(target_id, None)
+        if started is None:
+            raise ValueError("No recording profiles found")
+        return {"profile": self._fake_cpu_profile(started, time.time())}
+
+    def _fake_cpu_profile(self, started: float, ended: float) -> Dict:
+        """Call tree with recursion (render -> computeVolume -> render), sampled every 200us"""
+        def frame(node_id: int, name: str, url: str = "", line: int = -1, children: List[int] = ()) -> Dict:
+            return {"id": node_id, "callFrame": {"functionName": name, "scriptId": "1" if url else "0", "url": url,
+                                                 "lineNumber": line, "columnNumber": 0},
+                    "hitCount": 0, "children": list(children)}
+
+        app = "http://fake/assets/index.js"
+        nodes = [frame(1, "(root)", children=[2, 3, 4]), frame(2, "(program)"), frame(3, "(idle)"),
+                 frame(4, "render", app, 10, [5, 8]), frame(5, "computeVolume", app, 42, [6]),
+                 frame(6, "render", app, 10, [7]), frame(7, "computeVolume", app, 42),
+                 frame(8, "formatSet", "http://fake/assets/utils.js", 5)]
+        pattern = [5, 5, 7, 7, 7, 4, 8, 2, 3, 3]  # Leaf frame of each sample
+        samples = [pattern[index % len(pattern)] for index in range(max(int((ended - started) / 0.0002), 20))]
+        for node_id in samples:
+            nodes[node_id - 1]["hitCount"] += 1
+        return {"nodes": nodes, "startTime": started * 1e6, "endTime": started * 1e6 + 200 * len(samples),
+                "samples": samples, "timeDeltas": [200] * len(samples)}
+
+    def _cmd_Profiler_takePreciseCoverage(self, client, target_id, params):
+        """Two bundles; index.js runs more of its functions as the page is interacted with"""
+        ran = 4 + self._target(target_id)["interactions"] // 2
+
+        def function(name: str, start: int, end: int, count: int, blocks=()) -> Dict:
+            return {"functionName": name, "isBlockCoverage": True,
+                    "ranges": [{"startOffset": start, "endOffset": end, "count": count}] +
+                              [{"startOffset": s, "endOffset": e, "count": c} for s, e, c in blocks]}
+
+        app = [function("", 0, 200000, 1)] + [
+            function(f"view{index}", index * 10000, index * 10000 + 8000, int(index <= ran),
+                     [(index * 10000 + 2000, index * 10000 + 3000, 0)]) for index in range(1, 20)]
+        vendor = [function("", 0, 100000, 1), function("unusedPolyfills", 30000, 100000, 0)]
+        return {"timestamp": time.monotonic(), "result": [
+            {"scriptId": "1", "url": "http://fake/assets/index.js", "functions": app},
+            {"scriptId": "2", "url": "http://fake/assets/vendor.js", "functions": vendor}
+        ]}
+
+    # CSS domain
+
+    def _cmd_CSS_enable(self, client, target_id, params):
+        self._target(target_id)
+        threading.Timer(0.01, self.emit, args=(target_id, "CSS.styleSheetAdded", {"header": {
+            "styleSheetId": "sheet-1", "frameId": target_id, "sourceURL": "http://fake/assets/index.css",
+            "origin": "regular", "length": 50000}})).start()
+        return {}
+
+    def _cmd_CSS_stopRuleUsageTracking(self, client, target_id, params):
+        return {"ruleUsage": [{"styleSheetId": "sheet-1", "startOffset": index * 500, "endOffset": index * 500 + 400,
+                               "used": index % 4 == 0} for index in range(100)]}
+
+    # HeapProfiler domain
+
+    def _cmd_HeapProfiler_takeHeapSnapshot(self, client, target_id, params):
+        self._target(target_id)
+        self._snapshots += 1
+        leaked = self._snapshots * self.leaked_per_snapshot + self._target(target_id)["interactions"]
+        snapshot = json.dumps(self._fake_heap_snapshot(leaked))
+        # Chunks stream as events before the command's reply, like Chrome's
+        for start in range(0, len(snapshot), 4096):
+            self.emit(target_id, "HeapProfiler.addHeapSnapshotChunk", {"chunk": snapshot[start:start + 4096]})
+        return {}
+
+    def _fake_heap_snapshot(self, leaked: int) -> Dict:
+        """A small FitForge-shaped heap whose handler closure holds ``leaked`` detached divs"""
+        node_types = ["hidden", "array", "string", "object", "code", "closure", "regexp", "number", "native",
+                      "synthetic", "concatenated string", "sliced string", "symbol", "bigint", "object shape"]
+        edge_types = ["context", "element", "property", "internal", "hidden", "shortcut", "weak"]
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+        nodes: List[List[int]] = []
+        edges: List[List[List[int]]] = []
+
+        def text(value: str) -> int:
+            if value not in string_ids:
+                string_ids[value] = len(strings)
+                strings.append(value)
+            return string_ids[value]
+
+        def node(kind: str, name: str, size: int, detached: int = 0) -> int:
+            nodes.append([node_types.index(kind), text(name), len(nodes) * 2 + 1, size, 0, 0, detached])
+            edges.append([])
+            return len(nodes) - 1
+
+        def edge(source: int, kind: str, name: str, target: int):
+            edges[source].append([edge_types.index(kind), text(name), target * 7])
+
+        root = node("synthetic", "", 0)
+        gc_roots = node("synthetic", "(GC roots)", 0)
+        window = node("object", "Window", 100, 1)
+        app = node("object", "FitForgeApp", 200)
+        handler = node("closure", "onSetLogged", 32)
+        body = node("native", "HTMLBodyElement", 120, 1)
+        edge(root, "element", "1", gc_roots)
+        edge(gc_roots, "element", "1", window)
+        edge(window, "property", "app", app)
+        edge(window, "property", "onSetLogged", handler)
+        edge(window, "property", "document", body)
+        for index in range(5):
+            workout = node("object", "WorkoutSession", 64)
+            sets = node("array", "(object elements)", 32 + 8 * index)
+            edge(app, "property", f"session{index}", workout)
+            edge(workout, "internal", "sets", sets)
+            edge(window, "weak", "cache", workout)
+        for index in range(leaked):
+            div = node("native", "Detached HTMLDivElement", 96, 2)
+            label = node("native", "Detached Text", 48, 2)
+            edge(handler, "context", f"row{index}", div)
+            edge(div, "element", "1", label)
+
+        for index, outgoing in enumerate(edges):
+            nodes[index][4] = len(outgoing)
+        return {
+            "snapshot": {
+                "meta": {
+                    "node_fields": ["type", "name", "id", "self_size", "edge_count", "trace_node_id", "detachedness"],
+                    "node_types": [node_types, "string", "number", "number", "number", "number", "number"],
+                    "edge_fields": ["type", "name_or_index", "to_node"],
+                    "edge_types": [edge_types, "string_or_number", "node"]
+                },
+                "node_count": len(nodes),
+                "edge_count": sum(len(outgoing) for outgoing in edges),
+                "trace_function_count": 0
+            },
+            "nodes": [value for fields in nodes for value in fields],
+            "edges": [value for outgoing in edges for fields in outgoing for value in fields],
+            "trace_function_infos": [], "trace_tree": [], "samples": [], "locations": [],
+            "strings": strings
+        }
+
+    # Runtime and Performance domains
+
+    def _cmd_Runtime_evaluate(self, client, target_id, params):
+        # Page script is not run: answers come from evaluate()/respond() scripting
+        self._target(target_id)
+        return {"result": {"type": "undefined"}}
+
+    def _cmd_Runtime_callFunctionOn(self, client, target_id, params):
+        target = self._target(target_id)
+        if params.get("objectId") != f"helpers.{target_id}" or not target["helpers"]:
+            raise ValueError("Could not find object with given id")
+        arguments = [argument.get("value") for argument in params.get("arguments", [])]
+        return self.call_helper(target_id, arguments[0], arguments[1] if len(arguments) > 1 else [])
+
+    def call_helper(self, target_id: str, name: str, args: List) -> Dict:
+        """Answer a helper runtime call on the target's helper object (objectId ``helpers.<target id>``)
+
+        Uses the ``helper.<name>`` scripting, else a successful default;
+        click/fill count as interactions for the fake leak.
+        """
+        if name in ("click", "fill"):
+            self._target(target_id)["interactions"] += 1
+        found, value = self._scripted(f"helper.{name}", {"args": args}, target_id)
+        if not found:
+            selectors = args[0] if args and isinstance(args[0], list) else []
+            value = {
+                "click": {"success": True, "selector": selectors[0] if selectors else None},
+                "fill": {"success": True, "selector": selectors[0] if selectors else None,
+                         "value": args[1] if len(args) > 1 else None},
+                "waitFor": {"success": True, "found": True, "selector": selectors[0] if selectors else None,
+                            "missing": [], "invalid": [], "waitTime": 0},
+                "domQuiet": {"quiet": True, "mutations": 0, "waitTime": 0},
+                "pageErrors": {"success": True, "errors": [], "errorCount": 0}
+            }.get(name)
+        return {"result": {"type": "object", "value": value}}
+
+    def _cmd_Runtime_getHeapUsage(self, client, target_id, params):
+        leaked = self._target(target_id)["interactions"] * self.leak_per_interaction
+        return {"usedSize": 8 * 1024 * 1024 + leaked, "totalSize": 16 * 1024 * 1024 + leaked}
+
+    def _cmd_Memory_getDOMCounters(self, client, target_id, params):
+        interactions = self._target(target_id)["interactions"] if self.leak_per_interaction else 0
+        return {"documents": 1, "nodes": 250 + 2 * interactions, "jsEventListeners": 40 + interactions}
+
+    def _cmd_Performance_getMetrics(self, client, target_id, params):
+        self._target(target_id)
+        return {"metrics": [
+            {"name": "Timestamp", "value": time.monotonic()},
+            {"name": "JSHeapUsedSize", "value": 8 * 1024 * 1024},
+            {"name": "JSHeapTotalSize", "value": 16 * 1024 * 1024},
+            {"name": "Nodes", "value": 250},
+            {"name": "LayoutDuration", "value": 0.01},
+            {"name": "ScriptDuration", "value": 0.05},
+            {"name": "TaskDuration", "value": 0.1}
+        ]}
+
+def _fake_remote_object(value: Any) -> Dict:
+    """Runtime.evaluate reply for a value returned by value"""
+    if value is None:
+        return {"result": {"type": "undefined"}}
+    kind = {bool: "boolean", int: "number", float: "number", str: "string"}.get(type(value), "object")
+    return {"result": {"type": kind, "value": value}}
+
+def script_debugger_page(fake: FakeCDPServer) -> FakeCDPServer:
+    """Script the page-side answers EnhancedWSLChromeDebugger relies on into a FakeCDPServer
+
+    Installing HELPER_RUNTIME_SCRIPT gives the document its helper object,
+    HELPER_HANDLE_EXPRESSION resolves it and helper calls through
+    HELPER_INVOKE_FUNCTION (the bridge's one-line form) reach call_helper.
+    TIME_ORIGIN_EXPRESSION and DOCUMENT_LOADED_SCRIPT report the current
+    document. Everything is keyed on the debugger's own constants, and tests
+    can override any of it with later evaluate()/respond() calls.
+    """
+    def install(params: Dict, target_id: str):
+        fake.targets[target_id]["helpers"] = True
+
+    def handle(params: Dict, target_id: str) -> Dict:
+        if fake.targets[target_id]["helpers"]:
+            return {"result": {"type": "object", "className": "Object", "objectId": f"helpers.{target_id}"}}
+        return {"result": {"type": "object", "subtype": "null", "value": None}}
+
+    invoke_prefix = f"({HELPER_INVOKE_FUNCTION})({HELPER_HANDLE_EXPRESSION}, "
+
+    def invoke(params: Dict, target_id: str) -> Dict:
+        if not fake.targets[target_id]["helpers"]:
+            return _fake_remote_object({"helpersMissing": True})
+        name, args = json.loads("[" + params["expression"][len(invoke_prefix):-1] + "]")
+        return fake.call_helper(target_id, name, args)
+
+    fake.evaluate(HELPER_RUNTIME_SCRIPT, install)
+    fake.respond("Runtime.evaluate", handle, when=lambda params: params.get("expression") == HELPER_HANDLE_EXPRESSION)
+    fake.respond("Runtime.evaluate", invoke,
+                 when=lambda params: params.get("expression", "").startswith(invoke_prefix))
+    fake.evaluate(TIME_ORIGIN_EXPRESSION, lambda params, target_id: fake.targets[target_id]["time_origin"])
+    fake.evaluate(lambda source: source.startswith(DOCUMENT_LOADED_SCRIPT),
+                  lambda params, target_id: {"timeOrigin": fake.targets[target_id]["time_origin"],
+                                             "url": fake.targets[target_id]["url"]})
+    return fake
+
+def run_fake_cdp_server(port: int = 9222, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+    """Serve a FakeCDPServer scripted for the debugger in the foreground until interrupted"""
+    server = script_debugger_page(FakeCDPServer(port, latency=latency_ms / 1000, jitter=jitter_ms / 1000)).start()
+    server.add_target("about:blank")
+    print(f"Fake CDP server on {server.base_url} (latency {latency_ms}ms ± {jitter_ms}ms)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    # fake_cdp.py [port] [latency_ms] [jitter_ms]
+    run_fake_cdp_server(*[int(sys.argv[1]) if len(sys.argv) > 1 else 9222] + [float(arg) for arg in sys.argv[2:4]])
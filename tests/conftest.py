@@ -0,0 +1,56 @@
+"""Shared fixtures for the wsl-chrome-mcp.py tests
+
+The debugger is a single script with a hyphenated name, so it is loaded by
+path. Browser-facing tests run against fake_cdp.FakeCDPServer scripted with
+script_debugger_page(), and the bridge against the Python bridge host.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "wsl-chrome-mcp.py")
+BRIDGE_HOST = [sys.executable, SCRIPT, "bridge-host"]
+TRANSPORTS = ("direct", "websocket", "bridge")
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("wsl_chrome_mcp", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["wsl_chrome_mcp"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+mcp = _load_module()
+sys.path.insert(0, ROOT)
+import fake_cdp  # Reuses the module loaded above
+
+
+@pytest.fixture
+def fake():
+    """A started FakeCDPServer with the page-side answers the debugger relies on"""
+    server = fake_cdp.script_debugger_page(fake_cdp.FakeCDPServer(load_delay=0.02)).start()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def make_debugger(fake):
+    """Build debuggers on the fake for a transport; all are closed after the test"""
+    debuggers = []
+
+    def build(transport: str = "websocket", **kwargs):
+        kwargs.setdefault("sample_interval", 0)
+        if transport == "bridge":
+            kwargs.setdefault("bridge_command", BRIDGE_HOST)
+        debugger = mcp.EnhancedWSLChromeDebugger(port=fake.port, transport=transport, launcher="external", **kwargs)
+        debuggers.append(debugger)
+        return debugger
+
+    yield build
+    for debugger in debuggers:
+        debugger.close()
@@ -0,0 +1,92 @@
+"""AsyncChromeDebugger: pipelined CDP commands over one connection per tab"""
+
+import asyncio
+import os
+import threading
+import time
+
+from conftest import fake_cdp, mcp
+
+DELAY = 0.3  # Seconds each slow collector command takes on the fake
+
+
+def slow(answer, log):
+    """Fake answer that takes DELAY seconds, logging when it ran"""
+    def respond(params, target_id):
+        started = time.monotonic()
+        time.sleep(DELAY)
+        with log["lock"]:
+            log["spans"].append((started, time.monotonic()))
+        return answer
+    return respond
+
+
+def test_out_of_order_replies_reach_their_callers(fake):
+    target = fake.add_target("http://app/")
+    fake.respond("Custom.sleep", lambda params, target_id: time.sleep(params["delay"]) or params)
+
+    async def run():
+        connection = await mcp.AsyncCDPConnection.connect(f"ws://127.0.0.1:{fake.port}/devtools/page/{target['id']}")
+        finished = []
+
+        async def call(n, delay):
+            reply = await connection.send_command("Custom.sleep", {"n": n, "delay": delay})
+            finished.append(n)
+            return reply["result"]["n"]
+
+        try:
+            started = time.perf_counter()
+            results = await asyncio.gather(call(0, 0.3), call(1, 0.1), call(2, 0.2))
+            return results, finished, time.perf_counter() - started
+        finally:
+            await connection.close()
+
+    results, finished, elapsed = asyncio.run(run())
+    assert results == [0, 1, 2]
+    assert finished == [1, 2, 0]  # Replies came back in a different order than sent
+    assert elapsed < 0.5  # Not 0.6: the commands were in flight together
+
+
+def test_analyze_webapp_collects_concurrently(fake):
+    log = {"lock": threading.Lock(), "spans": []}
+    fake.respond("Page.captureScreenshot", slow({"data": fake_cdp.FAKE_SCREENSHOT_PNG}, log))
+    fake.respond("Performance.getMetrics", slow({"metrics": [{"name": "Nodes", "value": 10}]}, log))
+    fake.evaluate(mcp.PAGE_ERRORS_SCRIPT, slow({"errors": []}, log))
+    fake.evaluate(mcp.PERFORMANCE_SNAPSHOT_SCRIPT, slow({"navigation": {}, "paint": {}}, log))
+
+    async def run():
+        debugger = mcp.AsyncChromeDebugger(port=fake.port)
+        try:
+            session_id = await debugger.start_debug_session("http://app/")
+            started = time.perf_counter()
+            report = await debugger.analyze_webapp()
+            return session_id, report, time.perf_counter() - started
+        finally:
+            await debugger.close()
+
+    session_id, report, elapsed = asyncio.run(run())
+    os.remove(f"/tmp/debug_{session_id}_initial.png")
+
+    assert report
+    spans = sorted(log["spans"])
+    assert len(spans) == 4
+    # All four slow commands were in flight at once: wall time tracks the slowest, not the sum
+    assert spans[-1][0] < spans[0][1]
+    assert elapsed < 2 * DELAY < len(spans) * DELAY
+
+
+def test_commands_fail_cleanly_when_the_connection_drops(fake):
+    target = fake.add_target("http://app/")
+    fake.respond("Custom.hang", lambda params, target_id: time.sleep(5))
+
+    async def run():
+        debugger = mcp.AsyncChromeDebugger(port=fake.port)
+        try:
+            pending = asyncio.ensure_future(debugger.send_command(target["id"], "Custom.hang"))
+            await asyncio.sleep(0.1)
+            await asyncio.to_thread(fake.remove_target, target["id"])
+            return await asyncio.wait_for(pending, 3)
+        finally:
+            await debugger.close()
+
+    assert "error" in asyncio.run(run())
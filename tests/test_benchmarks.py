@@ -0,0 +1,87 @@
+"""Benchmark comparison rules and the bench command line"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SCRIPT, mcp
+
+
+def results(**operations):
+    """Benchmark results with p50/p95/p99 = ``ms`` and the given throughput per operation"""
+    return {"operations": {name: {"p50_ms": ms, "p95_ms": ms, "p99_ms": ms, "throughput_per_s": ops}
+                           for name, (ms, ops) in operations.items()}}
+
+
+def flagged(entries):
+    return sorted((entry["operation"], entry["metric"]) for entry in entries)
+
+
+LATENCY = ["p50_ms", "p95_ms", "p99_ms"]
+
+
+@pytest.mark.parametrize("baseline, current, regressions, improvements", [
+    # 20% slower on every percentile, throughput unchanged
+    ((1.0, 1000), (1.2, 1000), LATENCY, []),
+    # Within the 10% threshold
+    ((1.0, 1000), (1.05, 1000), [], []),
+    # Relatively huge, but under the 0.05 ms noise floor
+    ((0.02, 1000), (0.06, 1000), [], []),
+    ((0.2, 1000), (0.26, 1000), LATENCY, []),
+    # Throughput: lower is worse, higher is better
+    ((1.0, 1000), (1.0, 800), ["throughput_per_s"], []),
+    ((1.0, 1000), (1.0, 1300), [], ["throughput_per_s"]),
+    # Faster latencies are improvements
+    ((1.0, 1000), (0.5, 1000), [], LATENCY),
+])
+def test_compare_benchmarks(baseline, current, regressions, improvements):
+    comparison = mcp.compare_benchmarks(results(op=baseline), results(op=current))
+    assert flagged(comparison["regressions"]) == sorted(("op", metric) for metric in regressions)
+    assert flagged(comparison["improvements"]) == sorted(("op", metric) for metric in improvements)
+
+
+def test_compare_benchmarks_threshold_and_entry_shape():
+    comparison = mcp.compare_benchmarks(results(op=(1.0, 1000)), results(op=(1.2, 1000)), threshold=0.25)
+    assert comparison["threshold"] == 0.25
+    assert comparison["regressions"] == []
+
+    entry = mcp.compare_benchmarks(results(op=(1.0, 1000)), results(op=(1.2, 1000)))["regressions"][0]
+    assert entry == {"operation": "op", "metric": "p50_ms", "baseline": 1.0, "current": 1.2, "change": 0.2}
+
+
+def test_compare_benchmarks_missing_and_new_operations():
+    comparison = mcp.compare_benchmarks(results(kept=(1.0, 10), dropped=(1.0, 10)),
+                                        results(kept=(1.0, 10), added=(9.0, 1)))
+    assert comparison["missing"] == ["dropped"]
+    assert comparison["regressions"] == comparison["improvements"] == []
+
+
+def test_compare_benchmarks_skips_metrics_without_a_baseline():
+    baseline = {"operations": {"op": {"p50_ms": 0, "throughput_per_s": None}}}
+    current = {"operations": {"op": {"p50_ms": 5.0, "throughput_per_s": 10}}}
+    assert mcp.compare_benchmarks(baseline, current)["regressions"] == []
+
+
+def test_bench_on_the_fake_backend(tmp_path):
+    out = tmp_path / "bench.json"
+    completed = subprocess.run([sys.executable, SCRIPT, "bench", "--backend", "fake", "--iterations", "5",
+                                "--warmup", "1", "--out", str(out)], capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+
+    data = json.loads(out.read_text())
+    assert data["meta"]["backend"] == "fake"
+    assert data["meta"]["iterations"] == 5
+    assert set(data["operations"]) == set(mcp.DEFAULT_BENCHMARK_OPERATIONS)
+    for name, stats in data["operations"].items():
+        assert stats["errors"] == 0, name
+        assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+    # A run compared with itself has nothing to report
+    assert mcp.run_benchmark_cli(["bench-compare", str(out), str(out)]) == 0
+    slower = json.loads(out.read_text())
+    for stats in slower["operations"].values():
+        stats.update({metric: value * 3 + 1 for metric, value in stats.items() if metric in LATENCY})
+    (tmp_path / "slower.json").write_text(json.dumps(slower))
+    assert mcp.run_benchmark_cli(["bench-compare", str(out), str(tmp_path / "slower.json")]) == 1
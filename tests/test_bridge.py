@@ -0,0 +1,115 @@
+"""PowerShellBridge protocol, served by the Python bridge host"""
+
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import BRIDGE_HOST, mcp
+
+
+@pytest.fixture
+def bridge():
+    bridge = mcp.PowerShellBridge(BRIDGE_HOST)
+    yield bridge
+    bridge.close()
+
+
+def test_ping_starts_host_once(bridge):
+    assert bridge.ping()
+    process = bridge._process
+    assert bridge.ping()
+    assert bridge._process is process
+    assert bridge.requests_served == 2
+
+
+def test_http_reaches_devtools_endpoint(bridge, fake):
+    reply = bridge.http("GET", f"{fake.base_url}/json/version")
+    assert reply["status"] == 200
+    assert json.loads(reply["body"])["webSocketDebuggerUrl"] == fake.browser_ws_url
+
+
+def test_cdp_command_round_trip(bridge, fake):
+    target = fake.add_target("http://app/")
+    ws_url = f"ws://127.0.0.1:{fake.port}/devtools/page/{target['id']}"
+    fake.respond("Custom.echo", lambda params, target_id: {"target": target_id, **params})
+    reply = bridge.cdp(ws_url, "Custom.echo", {"n": 7})
+    assert reply["result"] == {"target": target["id"], "n": 7}
+
+
+def test_concurrent_requests_get_their_own_replies(bridge, fake):
+    target = fake.add_target("http://app/")
+    ws_url = f"ws://127.0.0.1:{fake.port}/devtools/page/{target['id']}"
+    fake.respond("Custom.echo", lambda params, target_id: params)
+    results = {}
+
+    def call(n):
+        results[n] = bridge.cdp(ws_url, "Custom.echo", {"n": n})["result"]["n"]
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {n: n for n in range(10)}
+
+
+def test_host_errors_raise_bridge_error(bridge):
+    with pytest.raises(mcp.BridgeError, match="Unsupported bridge op"):
+        bridge.request("nonsense")
+    # PowerShell-only op
+    with pytest.raises(mcp.BridgeError):
+        bridge.run("Get-Date")
+    assert bridge.ping()
+
+
+def test_host_is_restarted_after_exit(bridge):
+    assert bridge.ping()
+    bridge._process.kill()
+    bridge._process.wait()
+    assert bridge.ping()
+
+
+def test_missing_host_command_raises():
+    bridge = mcp.PowerShellBridge(["/nonexistent/bridge-host"])
+    with pytest.raises(mcp.BridgeError):
+        bridge.request("ping", timeout=2)
+    assert not bridge.ping()
+
+
+# Hosts that answer ``replies`` requests and then exit
+def short_lived_host(replies):
+    return [sys.executable, "-c",
+            "import json, sys\n"
+            f"for _ in range({replies}):\n"
+            "    req = json.loads(sys.stdin.readline())\n"
+            "    print(json.dumps({'id': req['id'], 'ok': True, 'result': 'pong'}), flush=True)\n"]
+
+
+def test_requests_to_an_exiting_host_fail_fast():
+    bridge = mcp.PowerShellBridge(short_lived_host(0))
+    started = time.perf_counter()
+    with pytest.raises(mcp.BridgeError, match="exited"):
+        bridge.request("ping", timeout=10)
+    assert time.perf_counter() - started < 5
+    bridge.close()
+
+
+def test_old_host_exit_never_fails_requests_to_its_successor():
+    bridge = mcp.PowerShellBridge(short_lived_host(1))
+    outcomes = []
+    try:
+        for _ in range(30):
+            started = time.perf_counter()
+            try:
+                outcomes.append(bridge.request("ping", timeout=10))
+            except mcp.BridgeError as e:
+                # Only a request that reached the dying host may fail, and never by timing out
+                assert "exited" in str(e)
+                outcomes.append("exited")
+            assert time.perf_counter() - started < 5
+    finally:
+        bridge.close()
+    assert outcomes.count("pong") >= 15
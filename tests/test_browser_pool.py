@@ -0,0 +1,178 @@
+"""BrowserPool scheduling, crash recovery and shutdown, with FakeCDPServer instances as browsers"""
+
+import json
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from conftest import fake_cdp, mcp
+
+
+class FakeLauncher:
+    """LocalChromeLauncher stand-in: each start() serves a new FakeCDPServer on a new port"""
+
+    def __init__(self):
+        self.server = None
+        self.port = None
+        self.starts = 0
+
+    @property
+    def running(self):
+        return self.server is not None
+
+    def start(self):
+        self.server = fake_cdp.script_debugger_page(fake_cdp.FakeCDPServer(load_delay=0.01)).start()
+        self.port = self.server.port
+        self.starts += 1
+
+    def version(self):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/json/version", timeout=2) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError):
+            return None
+
+    def crash(self):
+        """Stop answering, like a browser that died; the process handle is gone too"""
+        server, self.server = self.server, None
+        if server is not None:
+            server.close()
+
+    def stop(self):
+        self.crash()
+
+
+def make_pool(size=1, **kwargs):
+    kwargs.setdefault("health_interval", 60)
+    return mcp.BrowserPool(size=size, launcher_factory=FakeLauncher,
+                           debugger_options={"transport": "websocket", "sample_interval": 0}, **kwargs)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_jobs_run_and_sessions_do_not_pile_up_in_reused_slots():
+    with make_pool() as pool:
+        debuggers = []
+
+        def job(debugger):
+            debuggers.append(debugger)
+            debugger.start_debug_session("http://app/")
+            debugger.take_screenshot()
+            return debugger.current_session
+
+        assert pool.submit(job).result(10)
+        assert pool.submit(job).result(10)
+
+    assert debuggers[0] is debuggers[1]
+    assert debuggers[0].sessions == {}
+    assert debuggers[0].current_session is None
+
+
+def test_job_that_hits_a_dead_browser_reruns_once_on_the_restarted_instance():
+    with make_pool(max_attempts=2) as pool:
+        launcher = pool.browsers[0].launcher
+        ports = []
+
+        def job(debugger):
+            ports.append(debugger.port)
+            if len(ports) == 1:
+                launcher.crash()
+                raise mcp.CDPConnectionError("browser went away")
+            return debugger.get_version()["Browser"]
+
+        assert pool.submit(job).result(10) == "FakeChrome/1.0"
+        assert len(ports) == 2
+        assert ports[1] == launcher.port != ports[0]
+        assert launcher.starts == 2
+        assert pool.stats["requeued"] == 1
+        assert pool.stats["restarts"] == 1
+
+
+def test_job_fails_after_max_attempts():
+    with make_pool(max_attempts=2) as pool:
+        runs = []
+
+        def job(debugger):
+            runs.append(1)
+            pool.browsers[0].launcher.crash()
+            raise mcp.CDPConnectionError("browser went away")
+
+        with pytest.raises(mcp.CDPConnectionError):
+            pool.submit(job).result(10)
+        assert len(runs) == 2
+
+
+def test_job_errors_on_a_healthy_browser_are_not_retried():
+    with make_pool() as pool:
+        runs = []
+
+        def job(debugger):
+            runs.append(1)
+            raise ValueError("bad job")
+
+        with pytest.raises(ValueError):
+            pool.submit(job).result(10)
+        assert runs == [1]
+        assert pool.stats["restarts"] == 0
+
+
+def test_a_crash_seen_by_several_jobs_restarts_the_browser_once():
+    with make_pool(sessions_per_browser=2) as pool:
+        launcher = pool.browsers[0].launcher
+        both_running = threading.Barrier(2)
+
+        def job(debugger):
+            if launcher.starts == 1:
+                both_running.wait(5)
+                launcher.crash()
+                raise mcp.CDPConnectionError("browser went away")
+            return launcher.starts
+
+        futures = [pool.submit(job) for _ in range(2)]
+        assert [future.result(10) for future in futures] == [2, 2]
+        assert pool.stats["restarts"] == 1
+        assert pool.stats["requeued"] == 2
+
+
+def test_supervisor_restarts_each_dead_instance_once():
+    with make_pool(size=2, health_interval=0.05) as pool:
+        for browser in pool.browsers:
+            browser.launcher.crash()
+        wait_until(lambda: all(browser.healthy and browser.restarts for browser in pool.browsers))
+        time.sleep(0.3)  # Several more health checks
+        assert [browser.restarts for browser in pool.browsers] == [1, 1]
+        assert [browser.launcher.starts for browser in pool.browsers] == [2, 2]
+        assert pool.submit(lambda debugger: debugger.get_version()["Browser"]).result(10) == "FakeChrome/1.0"
+
+
+def test_close_rejects_queued_jobs_and_waits_for_running_ones():
+    pool = make_pool().start()
+    running, release = threading.Event(), threading.Event()
+
+    def blocking(debugger):
+        running.set()
+        release.wait(10)
+        return "finished"
+
+    first = pool.submit(blocking)
+    assert running.wait(5)
+    queued = pool.submit(lambda debugger: "never runs")
+    closer = threading.Thread(target=pool.close)
+    closer.start()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        queued.result(5)
+    assert closer.is_alive()
+    release.set()
+    closer.join(10)
+    assert first.result(0) == "finished"
+    assert all(not browser.launcher.running for browser in pool.browsers)
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda debugger: None)
@@ -0,0 +1,58 @@
+"""JavaScript and CSS coverage merging"""
+
+import pytest
+
+from conftest import mcp
+
+
+@pytest.mark.parametrize("ranges, expected", [
+    ([(0, 100, 1)], [(0, 100)]),
+    ([(0, 100, 0)], []),
+    ([(0, 100, 1), (10, 20, 0)], [(0, 10), (20, 100)]),
+    ([(0, 100, 0), (10, 20, 3)], [(10, 20)]),
+    ([(0, 100, 1), (10, 50, 0), (20, 30, 2)], [(0, 10), (20, 30), (50, 100)]),
+    ([(0, 100, 1), (10, 20, 0), (20, 30, 0)], [(0, 10), (30, 100)]),
+    ([(10, 20, 0), (0, 100, 1)], [(0, 10), (20, 100)]),
+])
+def test_covered_ranges(ranges, expected):
+    assert mcp._covered_ranges(ranges) == expected
+
+
+def script(script_id, url, *ranges):
+    return {"scriptId": script_id, "url": url, "functions": [
+        {"functionName": "", "ranges": [{"startOffset": start, "endOffset": end, "count": count}
+                                        for start, end, count in ranges]}]}
+
+
+def test_js_coverage_is_merged_by_url_across_takes():
+    collector = mcp.CoverageCollector()
+    collector.add_js([script("1", "http://app/a.js", (0, 100, 1), (10, 40, 0), (60, 80, 0)),
+                      script("2", "", (0, 10, 1))])
+    # A reload gives the script a new id; the second take ran what the first skipped
+    collector.add_js([script("7", "http://app/a.js", (0, 100, 1), (10, 30, 0), (60, 80, 0))])
+    report = collector.report()
+
+    files = {entry["url"]: entry for entry in report["files"]}
+    assert files["http://app/a.js"] == {"url": "http://app/a.js", "type": "js", "total_bytes": 100,
+                                        "used_bytes": 60, "unused_bytes": 40, "unused_pct": 40.0}
+    assert files["(inline)"]["unused_bytes"] == 0
+    assert report["js_total_bytes"] == 110
+    assert report["js_unused_pct"] == round(40 / 110 * 100, 1)
+
+
+def test_css_rule_usage():
+    collector = mcp.CoverageCollector()
+    sheets = {"s1": {"sourceURL": "http://app/site.css", "length": 200}}
+    collector.add_css([{"styleSheetId": "s1", "startOffset": 0, "endOffset": 50, "used": True},
+                       {"styleSheetId": "s1", "startOffset": 40, "endOffset": 80, "used": True},
+                       {"styleSheetId": "s1", "startOffset": 80, "endOffset": 120, "used": False},
+                       {"styleSheetId": "s9", "startOffset": 0, "endOffset": 30, "used": False}], sheets)
+    report = collector.report()
+
+    files = {entry["url"]: entry for entry in report["files"]}
+    assert files["http://app/site.css"]["used_bytes"] == 80
+    assert files["http://app/site.css"]["unused_bytes"] == 120
+    assert files["(stylesheet s9)"]["unused_pct"] == 100.0
+    assert report["css_total_bytes"] == 230
+    assert report["js_total_bytes"] == 0
+    assert [entry["url"] for entry in report["files"]] == ["http://app/site.css", "(stylesheet s9)"]
@@ -0,0 +1,62 @@
+"""Self and total time aggregation over CPU profiles"""
+
+from conftest import mcp
+
+
+def frame(node_id, name, children=(), line=0, hits=0):
+    return {"id": node_id, "callFrame": {"functionName": name, "url": "app.js" if name != "(root)" else "",
+                                         "lineNumber": line}, "children": list(children), "hitCount": hits}
+
+
+# (root) -> main -> fib -> fib; samples land on main once, the outer fib twice, the inner fib seven times
+PROFILE = {
+    "nodes": [frame(1, "(root)", [2]), frame(2, "main", [3]), frame(3, "fib", [4], line=4), frame(4, "fib", line=4)],
+    "samples": [2, 3, 3, 4, 4, 1],
+    "timeDeltas": [0, 1000, 1000, 1000, 3000, 4000],
+}
+
+
+def by_function(entries):
+    return {entry["function"]: entry for entry in entries}
+
+
+def test_recursion_is_not_double_counted():
+    aggregate = mcp.CPUProfileAggregate()
+    aggregate.add(PROFILE)
+    top = by_function(aggregate.top())
+
+    assert list(top) == ["fib", "main"]
+    assert top["fib"] == {"function": "fib", "url": "app.js", "line": 5, "self_ms": 9.0, "total_ms": 9.0,
+                          "self_pct": 90.0}
+    assert top["main"]["self_ms"] == 1.0
+    assert top["main"]["total_ms"] == 10.0
+    assert aggregate.sampled_us == 10000
+
+
+def test_merge_reports_means_per_profile():
+    first, second = mcp.CPUProfileAggregate(), mcp.CPUProfileAggregate()
+    first.add(PROFILE)
+    second.add(PROFILE)
+    second.add({"nodes": [frame(1, "(root)", [2]), frame(2, "idle", hits=2)], "startTime": 0, "endTime": 4000})
+    first.merge(second)
+
+    top = by_function(first.top())
+    assert first.profiles == 3
+    assert top["fib"]["self_ms"] == 6.0
+    assert top["idle"]["self_ms"] == round(4000 / 3 / 1000, 3)
+    assert top["fib"]["self_pct"] == round(18000 / 24000 * 100, 1)
+
+
+def test_hit_counts_when_samples_are_missing():
+    aggregate = mcp.CPUProfileAggregate()
+    aggregate.add({"nodes": [frame(1, "(root)", [2], hits=1), frame(2, "work", hits=3)],
+                   "startTime": 0, "endTime": 8000})
+    assert aggregate.top() == [{"function": "work", "url": "app.js", "line": 1, "self_ms": 6.0, "total_ms": 6.0,
+                                "self_pct": 75.0}]
+
+
+def test_empty_profile():
+    aggregate = mcp.CPUProfileAggregate()
+    aggregate.add({})
+    assert aggregate.top() == []
+    assert aggregate.profiles == 1
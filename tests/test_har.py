@@ -0,0 +1,133 @@
+"""Streaming HAR export of a debug session's traffic"""
+
+import json
+import threading
+import time
+from datetime import datetime
+
+from conftest import mcp
+
+PHASES = ("blocked", "dns", "connect", "ssl", "send", "wait", "receive")
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def emit_redirect(fake, tab_id):
+    """http://app/old answers 302 to /new, on one requestId like Chrome"""
+    now = time.time()
+    request_id = "redirect"
+    fake.emit(tab_id, "Network.requestWillBeSent", {
+        "requestId": request_id, "timestamp": now, "wallTime": now, "type": "Document",
+        "request": {"url": "http://app/old", "method": "GET", "headers": {"Accept": "text/html"}}})
+    fake.emit(tab_id, "Network.requestWillBeSent", {
+        "requestId": request_id, "timestamp": now + 0.01, "wallTime": now + 0.01, "type": "Document",
+        "request": {"url": "http://app/new", "method": "GET", "headers": {}},
+        "redirectResponse": {"url": "http://app/old", "status": 302, "statusText": "Found",
+                             "headers": {"Location": "/new"}, "protocol": "http/1.1"}})
+    fake.emit(tab_id, "Network.responseReceived", {
+        "requestId": request_id, "timestamp": now + 0.05, "type": "Document",
+        "response": {"url": "http://app/new", "status": 200, "statusText": "OK", "headers": {},
+                     "mimeType": "text/html", "protocol": "http/1.1",
+                     "timing": {"requestTime": now + 0.012, "dnsStart": 0.5, "dnsEnd": 1.5, "connectStart": 1.5,
+                                "connectEnd": 6.0, "sslStart": 3.0, "sslEnd": 6.0, "sendStart": 6.5,
+                                "sendEnd": 7.0, "receiveHeadersEnd": 30.0}}})
+    fake.emit(tab_id, "Network.loadingFinished",
+              {"requestId": request_id, "timestamp": now + 0.06, "encodedDataLength": 10})
+
+
+def test_session_export_is_valid_har_with_redirects_failures_and_bodies(make_debugger, fake, tmp_path):
+    fake.navigation_requests = [{"url": "http://app/api/workouts?page=2", "status": 200, "body": '{"sets": 3}'},
+                                {"url": "http://app/broken.js", "type": "Script", "failed": True}]
+    fake.respond("Network.getResponseBody", {"body": "<h1>new</h1>", "base64Encoded": False},
+                 when=lambda params: params["requestId"] == "redirect")
+    debugger = make_debugger()
+    path = str(tmp_path / "session.har")
+    session_id = debugger.start_debug_session("http://app/", har_path=path, har_bodies=True)
+    session = debugger.sessions[session_id]
+    emit_redirect(fake, session.tab_id)
+    wait_until(lambda: session.network_stats["finished"] + session.network_stats["failed"] == 4)
+
+    stats = debugger.stop_har_export()
+
+    assert stats["entries"] == 4
+    assert stats["bodies"] == 2  # Not for the redirect hop or the failed request
+    with open(path) as f:
+        har = json.load(f)["log"]
+    assert har["version"] == "1.2"
+    assert har["pages"][0]["title"] == "http://app/"
+    entries = {entry["request"]["url"]: entry for entry in har["entries"]}
+    assert set(entries) == {"http://app/api/workouts?page=2", "http://app/broken.js",
+                            "http://app/old", "http://app/new"}
+
+    for entry in har["entries"]:
+        assert {"startedDateTime", "time", "request", "response", "cache", "timings"} <= set(entry)
+        datetime.fromisoformat(entry["startedDateTime"])
+        timings = entry["timings"]
+        assert set(PHASES) <= set(timings)
+        assert all(timings[name] >= 0 for name in ("send", "wait", "receive"))
+        assert all(timings[name] >= 0 or timings[name] == -1 for name in PHASES)
+        # ssl is part of connect, so it is left out of the total
+        assert entry["time"] == round(sum(timings[name] for name in PHASES if name != "ssl" and timings[name] > 0), 3)
+
+    hop = entries["http://app/old"]["response"]
+    assert hop["status"] == 302
+    assert hop["redirectURL"] == "/new"
+    assert "text" not in hop["content"]
+
+    final = entries["http://app/new"]
+    assert final["response"]["content"] == {"size": 12, "mimeType": "text/html", "text": "<h1>new</h1>"}
+    assert final["timings"]["dns"] == 1.0
+    assert final["timings"]["connect"] == 4.5
+    assert final["timings"]["ssl"] == 3.0
+    assert final["timings"]["wait"] == 23.0
+    assert final["request"]["headers"] == []
+
+    api = entries["http://app/api/workouts?page=2"]
+    assert api["request"]["queryString"] == [{"name": "page", "value": "2"}]
+    assert api["response"]["content"]["text"] == '{"sets": 3}'
+
+    failed = entries["http://app/broken.js"]
+    assert failed["response"]["status"] == 0
+    assert failed["_error"] == "net::ERR_FAILED"
+    assert failed["_resourceType"] == "script"
+
+
+def record(index, status=200, size=100):
+    return mcp.NetworkRequest(url=f"http://app/{index}", method="GET", status=status, request_id=str(index),
+                              response_size=size, timing={"total": 5})
+
+
+def test_bodies_are_dropped_rather_than_queued_past_max_pending(tmp_path):
+    release = threading.Event()
+
+    def slow_fetch(request_id):
+        release.wait(5)
+        return f"body {request_id}", False
+
+    writer = mcp.HARWriter(str(tmp_path / "bodies.har"), fetch_body=slow_fetch, max_body_size=1000, max_pending=1)
+    writer.add(record(1))  # Queued, blocks the fetch thread
+    writer.add(record(2))
+    writer.add(record(3))
+    writer.add(record(4, size=5000))  # Too large to fetch at all
+    writer.add(record(5, status=304))  # No body to fetch
+    release.set()
+    stats = writer.close()
+
+    assert stats == {"path": str(tmp_path / "bodies.har"), "entries": 5, "bodies": 1, "bodies_too_large": 1,
+                     "bodies_dropped": 2}
+    with open(stats["path"]) as f:
+        entries = {entry["request"]["url"]: entry for entry in json.load(f)["log"]["entries"]}
+    assert entries["http://app/1"]["response"]["content"]["text"] == "body 1"
+    assert "text" not in entries["http://app/2"]["response"]["content"]
+
+
+def test_empty_export_is_still_valid(tmp_path):
+    writer = mcp.HARWriter(str(tmp_path / "empty.har"), page_url="http://app/")
+    assert writer.close()["entries"] == 0
+    with open(tmp_path / "empty.har") as f:
+        assert json.load(f)["log"]["entries"] == []
@@ -0,0 +1,84 @@
+"""Heap snapshot summaries: dominator-tree retained sizes and detached DOM nodes"""
+
+import json
+
+import pytest
+
+from conftest import fake_cdp, mcp
+
+NODE_TYPES = ["hidden", "object", "native"]
+EDGE_TYPES = ["element", "property", "weak"]
+NODE_FIELDS = ["type", "name", "id", "self_size", "edge_count", "detachedness"]
+STRINGS = ["", "Foo", "Bar", "Detached HTMLDivElement", "e"]
+
+
+def snapshot(nodes, edges):
+    """``nodes``: (type, name, self size, detachedness); ``edges``: per node, (type, target node index)"""
+    width = len(NODE_FIELDS)
+    return {
+        "snapshot": {"meta": {"node_fields": NODE_FIELDS,
+                              "node_types": [NODE_TYPES, "string", "number", "number", "number", "number"],
+                              "edge_fields": ["type", "name_or_index", "to_node"],
+                              "edge_types": [EDGE_TYPES, "string_or_number", "node"]}},
+        "nodes": [value for index, (kind, name, size, detached) in enumerate(nodes)
+                  for value in (NODE_TYPES.index(kind), STRINGS.index(name), index, size,
+                                len(edges[index]), detached)],
+        "edges": [value for outgoing in edges for kind, target in outgoing
+                  for value in (EDGE_TYPES.index(kind), STRINGS.index("e"), target * width)],
+        "strings": STRINGS
+    }
+
+
+@pytest.fixture
+def write_snapshot(tmp_path):
+    def write(data):
+        path = tmp_path / "heap.heapsnapshot"
+        path.write_text(json.dumps(data))
+        return str(path)
+    return write
+
+
+def test_diamond_retained_sizes(write_snapshot):
+    # root -> A, B (both Foo) -> C (Bar) -> D (detached div), F (Bar); root -weak-> E (Bar)
+    path = write_snapshot(snapshot(
+        [("hidden", "", 0, 0), ("object", "Foo", 10, 0), ("object", "Foo", 20, 0), ("object", "Bar", 5, 0),
+         ("native", "Detached HTMLDivElement", 7, 2), ("object", "Bar", 100, 0), ("object", "Bar", 3, 0)],
+        [[("element", 1), ("element", 2), ("weak", 5)], [("property", 3)], [("property", 3)],
+         [("element", 4), ("element", 6)], [], [], []]))
+
+    summary = mcp.summarize_heap_snapshot(path)
+
+    assert summary["node_count"] == 7
+    assert summary["total_size"] == 145
+    # E is only weakly held
+    assert summary["reachable_size"] == 45
+    # C is shared by A and B, so neither retains it; F sits under C and is not counted twice for Bar
+    assert summary["constructors"] == [
+        {"name": "Foo", "count": 2, "self_size": 30, "retained_size": 30},
+        {"name": "Bar", "count": 2, "self_size": 8, "retained_size": 15},
+        {"name": "Detached HTMLDivElement", "count": 1, "self_size": 7, "retained_size": 7},
+    ]
+    assert summary["detached"] == {"nodes": 1, "self_size": 7, "by_constructor": [
+        {"name": "Detached HTMLDivElement", "count": 1, "self_size": 7}]}
+
+
+def test_detached_names_without_detachedness_field(write_snapshot):
+    data = snapshot([("hidden", "", 0, 0), ("native", "Detached HTMLDivElement", 7, 0)], [[("element", 1)], []])
+    fields = data["snapshot"]["meta"]["node_fields"] = NODE_FIELDS[:-1]
+    data["nodes"] = [value for index, value in enumerate(data["nodes"]) if index % len(NODE_FIELDS) < len(fields)]
+    data["edges"][2] = len(fields)
+    assert mcp.summarize_heap_snapshot(write_snapshot(data))["detached"]["nodes"] == 1
+
+
+def test_fake_server_snapshot_reports_its_leak(write_snapshot):
+    path = write_snapshot(fake_cdp.FakeCDPServer()._fake_heap_snapshot(leaked=3))
+    summary = mcp.summarize_heap_snapshot(path)
+    assert summary["detached"]["nodes"] == 6
+    assert summary["detached"]["self_size"] == 3 * (96 + 48)
+    sessions = next(entry for entry in summary["constructors"] if entry["name"] == "WorkoutSession")
+    assert sessions["count"] == 5
+
+
+def test_not_a_snapshot(write_snapshot):
+    with pytest.raises(ValueError):
+        mcp.summarize_heap_snapshot(write_snapshot({"nodes": []}))
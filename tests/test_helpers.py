@@ -0,0 +1,37 @@
+"""Injected helper runtime: element helpers and navigation keep working across documents"""
+
+import pytest
+
+from conftest import TRANSPORTS
+
+
+def _tab(debugger, session_id):
+    return debugger.sessions[session_id].tab_id
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_helper_calls_and_scripted_failures(make_debugger, fake, transport):
+    debugger = make_debugger(transport)
+    debugger.start_debug_session("http://app/")
+    fake.respond("helper.click", {"success": False, "error": "Element not found"},
+                 when=lambda params: params["args"][0] == ["#missing"])
+
+    assert debugger.click_element("#go")["result"]["value"] == {"success": True, "selector": "#go"}
+    assert debugger.click_element("#missing")["result"]["value"]["success"] is False
+    filled = debugger.fill_input("#name", 'bob "quoted"')["result"]["value"]
+    assert filled["value"] == 'bob "quoted"'
+    assert debugger.wait_for_element("#a, #b", timeout=1)["result"]["value"]["success"]
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_navigate_to_passes_url_verbatim_and_keeps_helpers_working(make_debugger, fake, transport):
+    debugger = make_debugger(transport)
+    session_id = debugger.start_debug_session("http://app/")
+    url = 'http://app/x?q="a\'b"</script>'
+
+    result = debugger.navigate_to(url)
+
+    assert result["result"]["value"] == {"success": True, "url": url}
+    assert fake.targets[_tab(debugger, session_id)]["url"] == url
+    # The new document gets the helper runtime again from the registered script or a reinstall
+    assert debugger.click_element("#go")["result"]["value"]["success"]
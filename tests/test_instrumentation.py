@@ -0,0 +1,46 @@
+"""Per-method tooling overhead histograms in the debug report"""
+
+import os
+
+from conftest import mcp
+
+
+def test_analysis_reports_phase_histograms_per_method(make_debugger, fake):
+    debugger = make_debugger()
+    report = debugger.analyze_webapp("http://app/")
+    os.remove(f"/tmp/debug_{report['session_id']}_initial.png")
+
+    overhead = report["tooling_overhead"]
+    methods = overhead["methods"]
+    assert overhead["total_calls"] == sum(row["calls"] for row in methods.values())
+    assert {"cdp Page.navigate", "cdp Runtime.evaluate", "http PUT /json/new", "screenshot capture"} <= set(methods)
+    assert methods["cdp Page.navigate"]["calls"] == 1
+    assert methods["cdp Runtime.evaluate"]["calls"] > 1
+
+    for name, row in methods.items():
+        assert row["errors"] == 0, name
+        assert sum(row["histogram"].values()) == row["calls"], name
+        for phase in row["phases"].values():
+            assert 0 <= phase["mean_ms"] <= phase["total_ms"], name
+        if name.startswith(("cdp ", "http ")):
+            assert set(row["phases"]) == {"serialize", "wire", "parse"}, name
+            assert row["bytes_out"] > 0 and row["bytes_in"] > 0, name
+            assert row["browser_estimate_ms"] >= 0, name
+
+    assert set(methods["screenshot capture"]["phases"]) == {"capture", "decode", "write"}
+    assert set(overhead["network_floor_ms"]) == {"cdp", "http"}
+    assert set(overhead["phase_totals_ms"]) == {"serialize", "wire", "parse", "capture", "decode", "write"}
+
+
+def test_failed_commands_count_as_errors(make_debugger, fake):
+    fake.respond("Custom.fail", error="Not allowed")
+    debugger = make_debugger()
+    tab_id = debugger.sessions[debugger.start_debug_session("http://app/")].tab_id
+    debugger.instrumentation.reset()
+
+    debugger._send_devtools_command(tab_id, "Custom.fail", {})
+    debugger._send_devtools_command(tab_id, "Custom.fail", {})
+
+    row = debugger.instrumentation.report()["methods"]["cdp Custom.fail"]
+    assert row["calls"] == 2
+    assert row["errors"] == 2
@@ -0,0 +1,43 @@
+"""Repeated-loop memory leak detection against the fake page, which leaks on every helper click"""
+
+import os
+
+from conftest import mcp
+
+
+def test_leaking_flow_is_flagged_with_a_snapshot_diff_and_a_steady_one_is_not(make_debugger, fake):
+    debugger = make_debugger()
+    session_id = debugger.start_debug_session("http://app/")
+
+    report = debugger.detect_memory_leaks({"start_workout": ["Click Start Workout button"],
+                                           "idle": ["Let the page settle"]}, iterations=4)
+
+    leaking, steady = report["flows"]["start_workout"], report["flows"]["idle"]
+    assert report["suspects"] == ["start_workout"]
+    assert set(leaking["suspect_metrics"]) == {"heap_used", "dom_nodes", "listeners"}
+    assert leaking["growth"]["heap_used"]["slope_per_iteration"] == fake.leak_per_interaction
+    assert len(leaking["samples"]) == 5
+
+    diff = leaking["snapshot_diff"]
+    try:
+        assert diff["detached_nodes_delta"] > 0
+        assert diff["grown_constructors"][0]["name"] == "Detached HTMLDivElement"
+        assert mcp.summarize_heap_snapshot(diff["after"])["detached"]["nodes"] > \
+            mcp.summarize_heap_snapshot(diff["before"])["detached"]["nodes"]
+    finally:
+        for path in (diff["before"], diff["after"]):
+            os.remove(path)
+
+    assert not steady["suspect"]
+    assert "snapshot_diff" not in steady
+    assert steady["growth"]["heap_used"]["slope_per_iteration"] == 0
+    assert debugger.sessions[session_id].leak_reports == [report]
+
+
+def test_snapshot_diff_can_be_skipped(make_debugger):
+    debugger = make_debugger()
+    debugger.start_debug_session("http://app/")
+    report = debugger.detect_memory_leaks({"start_workout": ["Click Start Workout button"]}, iterations=3,
+                                          snapshot_diff=False)
+    assert report["suspects"] == ["start_workout"]
+    assert "snapshot_diff" not in report["flows"]["start_workout"]
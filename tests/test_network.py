@@ -0,0 +1,34 @@
+"""Network domain capture and the API analysis built on it"""
+
+from datetime import datetime
+
+import pytest
+
+from conftest import mcp
+
+
+STREAMING = ("direct", "websocket")  # Transports that deliver protocol events
+
+
+@pytest.mark.parametrize("transport", STREAMING)
+def test_network_traffic_is_captured(make_debugger, fake, transport):
+    fake.navigation_requests = [{"url": "http://app/api/workouts", "status": 200},
+                                {"url": "http://app/api/broken", "status": 500},
+                                {"url": "http://app/main.js", "failed": True}]
+    debugger = make_debugger(transport)
+    session = debugger.sessions[debugger.start_debug_session("http://app/")]
+    captured = {request.url: request for request in session.network_requests}
+    assert captured["http://app/api/workouts"].status == 200
+    assert captured["http://app/api/broken"].failed
+    assert captured["http://app/main.js"].error_message == "net::ERR_FAILED"
+    assert session.network_stats["observed"] == 3
+
+
+def test_api_analysis_ignores_api_paths_in_query_strings():
+    debugger = mcp.EnhancedWSLChromeDebugger(sample_interval=0, launcher="external")
+    session = mcp.DebugSession("s", "http://app/", datetime.now())
+    for url in ("http://app/login?next=/api/workouts", "http://app/api/workouts?page=2", "http://app/api/workouts"):
+        session.network_requests.append(mcp.NetworkRequest(url=url, method="GET", status=200, timing={"total": 5}))
+    data = debugger._analyze_data(session)
+    assert data["total_api_calls"] == 2
+    assert list(data["endpoints"]) == ["GET /api/workouts"]
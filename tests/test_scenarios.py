@@ -0,0 +1,81 @@
+"""Parallel scenario runner and the grouping of dependent scenarios into tabs"""
+
+import pytest
+
+from conftest import mcp
+
+
+def indices(groups):
+    return [[index for index, _ in group] for group in groups]
+
+
+def test_fitforge_suite_keeps_the_workout_flow_in_one_tab():
+    groups = mcp._group_dependent_scenarios(mcp.FITFORGE_TEST_SCENARIOS, mcp.FITFORGE_SCENARIO_DEPENDENCIES)
+    assert indices(groups) == [[0, 1, 2, 3, 4], [5], [6], [7]]
+    assert groups[0][0] == (0, "Navigate to /workouts page")
+
+
+def test_prerequisites_come_first_whatever_the_input_order():
+    scenarios = ["Click Start Workout button", "Verify user preferences", "Navigate to /workouts page"]
+    groups = mcp._group_dependent_scenarios(scenarios, mcp.FITFORGE_SCENARIO_DEPENDENCIES)
+    assert groups == [[(2, "Navigate to /workouts page"), (0, "Click Start Workout button")],
+                      [(1, "Verify user preferences")]]
+
+
+def test_missing_prerequisites_do_not_link_scenarios():
+    scenarios = ["Complete workout session", "Select exercise from workout types"]
+    groups = mcp._group_dependent_scenarios(scenarios, mcp.FITFORGE_SCENARIO_DEPENDENCIES)
+    assert indices(groups) == [[0], [1]]
+
+
+def test_transitive_dependencies_share_a_group():
+    groups = mcp._group_dependent_scenarios(["c", "x", "b", "a"], {"c": ["b"], "b": ["a"]})
+    assert indices(groups) == [[3, 2, 0], [1]]
+
+
+def test_cycles_fall_back_to_input_order():
+    groups = mcp._group_dependent_scenarios(["a step", "b step"], {"a": ["b"], "b": ["a"]})
+    assert indices(groups) == [[0, 1]]
+
+
+def test_no_dependencies_means_one_group_each():
+    assert indices(mcp._group_dependent_scenarios(["a", "b"], {})) == [[0], [1]]
+
+
+SCENARIOS = ["Navigate to /workouts page", "Click Start Workout button", "Select exercise from workout types",
+             "Check progress analytics page", "Verify user preferences"]
+
+
+@pytest.mark.parametrize("contexts", [1, 4])
+def test_scenario_runner_accepts_no_scenarios(make_debugger, contexts):
+    debugger = make_debugger("websocket")
+    debugger.start_debug_session("http://app/")
+    assert debugger._run_test_scenarios([], contexts=contexts) == []
+
+
+@pytest.mark.parametrize("contexts", [1, 3])
+def test_scenario_runner_keeps_order(make_debugger, contexts):
+    debugger = make_debugger("websocket")
+    session_id = debugger.start_debug_session("http://app/")
+    steps = debugger._run_test_scenarios(SCENARIOS, contexts=contexts)
+    assert [step.action for step in steps] == SCENARIOS
+    assert [step.step_name for step in steps] == [f"scenario_{index + 1}" for index in range(len(SCENARIOS))]
+    assert all(step.success for step in steps), [step.error_message for step in steps]
+    assert debugger.sessions[session_id].user_flows == steps
+
+
+def test_parallel_scenarios_run_in_isolated_tabs_that_feed_the_session(make_debugger, fake):
+    fake.navigation_requests = [{"url": "http://app/api/workouts"}]
+    contexts_created = []
+    fake.respond("Target.createBrowserContext",
+                 lambda params, target_id: contexts_created.append(1) or {"browserContextId": f"C{len(contexts_created)}"})
+    debugger = make_debugger("websocket")
+    session = debugger.sessions[debugger.start_debug_session("http://app/")]
+
+    debugger._run_test_scenarios(SCENARIOS, contexts=3)
+
+    # Navigate/Start/Select share a tab; the other two get one each
+    assert len(contexts_created) == 3
+    assert session.network_stats["finished"] == 1 + 3
+    assert len(session.network_requests) == 4
+    assert [tab for tab in fake.targets.values() if tab.get("browserContextId")] == []
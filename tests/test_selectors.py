@@ -0,0 +1,24 @@
+"""Selector list splitting used by the helper runtime's selector engine"""
+
+import pytest
+
+from conftest import mcp
+
+
+@pytest.mark.parametrize("selector, expected", [
+    ("#go", ["#go"]),
+    ("#a, .b ,c", ["#a", ".b", "c"]),
+    (":contains('a, b'), button", [":contains('a, b')", "button"]),
+    (':text("x,y")', [':text("x,y")']),
+    ("[title='x,y'], [data-a=\"1,2\"]", ["[title='x,y']", "[data-a=\"1,2\"]"]),
+    (":is(a, b) > c, d", [":is(a, b) > c", "d"]),
+    (":role(button, 'Save, then close')", [":role(button, 'Save, then close')"]),
+    ("a,, b,", ["a", "b"]),
+    ("", []),
+])
+def test_split_selectors(selector, expected):
+    assert mcp._split_selectors(selector) == expected
+
+
+def test_unbalanced_closers_do_not_block_later_splits():
+    assert mcp._split_selectors("a), b") == ["a)", "b"]
@@ -0,0 +1,99 @@
+"""Warm tab pool behind start_debug_session, against FakeCDPServer"""
+
+import time
+
+from conftest import mcp
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def session_tab(debugger, url="http://app/"):
+    return debugger.sessions[debugger.start_debug_session(url)].tab_id
+
+
+def test_warm_lease_reuses_a_reset_tab(make_debugger, fake):
+    reset_in = []
+    fake.evaluate(mcp.TAB_RESET_SCRIPT, lambda params, target_id: reset_in.append(target_id) or "http://app")
+    debugger = make_debugger()
+
+    first = session_tab(debugger)
+    debugger.end_debug_session()
+    assert reset_in == [first]
+    assert fake.calls["Storage.clearDataForOrigin"] == 1
+    assert fake.targets[first]["url"] == "about:blank"
+
+    # The spare opened in the background is leased first, then the reset tab
+    wait_until(lambda: len(debugger.tab_pool._idle) == 2)
+    spare = debugger.tab_pool._idle[0]["id"]
+    assert [session_tab(debugger), session_tab(debugger)] == [spare, first]
+    assert debugger.tab_pool.stats["warm_leases"] == 2
+    assert debugger.tab_pool.stats["reset"] == 1
+
+
+def test_leasing_tops_up_a_spare_in_the_background(make_debugger, fake):
+    debugger = make_debugger()
+    leased = session_tab(debugger)
+    wait_until(lambda: len(debugger.tab_pool._idle) == 1)
+    spare = debugger.tab_pool._idle[0]["id"]
+    assert spare != leased
+    assert set(fake.targets) == {leased, spare}
+
+
+def test_failed_reset_evicts_the_tab(make_debugger, fake):
+    fake.evaluate(mcp.TAB_RESET_SCRIPT, error="Target crashed")
+    debugger = make_debugger()
+    tab_id = session_tab(debugger)
+    debugger.end_debug_session()
+
+    assert tab_id not in fake.targets
+    assert tab_id not in [tab["id"] for tab in debugger.tab_pool._idle]
+    assert debugger.tab_pool.stats["evicted"] == 1
+    assert session_tab(debugger) != tab_id
+
+
+def test_tabs_serve_at_most_max_uses_leases(make_debugger, fake):
+    debugger = make_debugger()
+    debugger.tab_pool.max_uses = 1
+    tab_id = session_tab(debugger)
+    debugger.end_debug_session()
+    assert tab_id not in fake.targets
+    assert session_tab(debugger) != tab_id
+
+
+def test_tabs_closed_elsewhere_are_never_leased(make_debugger, fake):
+    debugger = make_debugger()
+    debugger.tab_pool_size = 3
+    first, second = session_tab(debugger), session_tab(debugger, "http://app/2")
+    for session_id in list(debugger.sessions):
+        debugger.end_debug_session(session_id)
+    wait_until(lambda: len(debugger.tab_pool._idle) == 3)
+    idle = [tab["id"] for tab in debugger.tab_pool._idle]
+    assert {first, second} <= set(idle)
+
+    debugger.close_tab(idle[0])  # Through the debugger: discard()
+    fake.remove_target(idle[1])  # Behind its back: alive() says no
+    wait_until(lambda: not debugger.targets.alive(idle[1]))
+
+    leased = {session_tab(debugger, f"http://app/{n}") for n in range(3)}
+    assert not leased & {idle[0], idle[1]}
+    assert idle[2] in leased
+
+
+def test_close_leaves_no_tabs_open(make_debugger, fake):
+    debugger = make_debugger()
+    leased = session_tab(debugger)
+    wait_until(lambda: len(debugger.tab_pool._idle) == 1)
+    pool = debugger.tab_pool
+
+    pool.close()
+    assert list(fake.targets) == [leased]
+    # Leased tabs are closed when they come back
+    pool.release(leased)
+    assert list(fake.targets) == []
+    pool.replenish()
+    assert list(fake.targets) == []
@@ -0,0 +1,82 @@
+"""Main-thread summaries of Chrome trace files"""
+
+import json
+
+import pytest
+
+from conftest import mcp
+
+MAIN = {"pid": 1, "tid": 1}
+
+
+def event(name, ph, ts_ms, dur_ms=None, url=None, **where):
+    record = dict(where or MAIN, name=name, ph=ph, ts=ts_ms * 1000)
+    if dur_ms is not None:
+        record["dur"] = dur_ms * 1000
+    if url:
+        record["args"] = {"data": {"url": url}}
+    return record
+
+
+@pytest.fixture
+def write_trace(tmp_path):
+    def write(events):
+        path = tmp_path / "trace.json"
+        path.write_text(json.dumps({"traceEvents": events}))
+        return str(path)
+    return write
+
+
+def test_nested_breakdown_events_count_self_time(write_trace):
+    path = write_trace([
+        dict(MAIN, ph="M", name="thread_name", args={"name": "CrRendererMain"}),
+        event("RunTask", "X", 0, 170),
+        event("FunctionCall", "X", 0, 100, url="a.js"),
+        event("Layout", "X", 10, 20),
+        event("EvaluateScript", "X", 40, 30, url="b.js"),
+        event("UpdateLayoutTree", "X", 50, 10),
+        event("Paint", "X", 100, 5),
+        event("EvaluateScript", "B", 110, url="b.js"),
+        event("EvaluateScript", "E", 150),
+        # Busier, but not the renderer main thread
+        dict(event("RunTask", "X", 0, 500), pid=1, tid=2),
+    ])
+    summary = mcp.summarize_trace(path)
+
+    assert summary["main_thread"] == {"pid": 1, "tid": 1, "name": "CrRendererMain"}
+    assert summary["breakdown_ms"] == {"script": 110.0, "layout": 20.0, "style": 10.0, "paint": 5.0}
+    assert summary["top_scripts"] == [{"url": "b.js", "ms": 60.0}, {"url": "a.js", "ms": 50.0}]
+    assert summary["main_thread_busy_ms"] == 170.0
+    assert summary["tasks"] == 1
+    assert summary["long_tasks"] == 1
+    assert summary["total_blocking_ms"] == 120.0
+    assert summary["duration_ms"] == 500.0
+
+
+def test_breakdown_never_exceeds_the_enclosing_task(write_trace):
+    path = write_trace([
+        event("RunTask", "X", 0, 40),
+        event("FunctionCall", "B", 0, url="a.js"),
+        event("FunctionCall", "X", 5, 30, url="a.js"),
+        event("RunMicrotasks", "X", 10, 10),
+        event("FunctionCall", "E", 40),
+    ])
+    summary = mcp.summarize_trace(path)
+    assert summary["breakdown_ms"] == {"script": 40.0}
+    assert summary["top_scripts"] == [{"url": "a.js", "ms": 30.0}]
+    assert summary["long_tasks"] == 0
+
+
+def test_out_of_order_events_are_counted_whole(write_trace):
+    path = write_trace([
+        event("RunTask", "X", 0, 30),
+        event("Layout", "X", 20, 10),
+        event("Paint", "X", 0, 5),
+    ])
+    assert mcp.summarize_trace(path)["breakdown_ms"] == {"layout": 10.0, "paint": 5.0}
+
+
+def test_empty_trace(write_trace):
+    summary = mcp.summarize_trace(write_trace([]))
+    assert summary["events"] == 0
+    assert summary["main_thread"] is None
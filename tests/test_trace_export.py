@@ -0,0 +1,90 @@
+"""Chrome trace export of the debugger's own activity"""
+
+import json
+import os
+from collections import defaultdict
+
+from conftest import mcp
+
+EPSILON_US = 0.01  # Rounding slack between a span and its parent
+
+
+def load_trace(path):
+    with open(path) as f:
+        trace = json.load(f)
+    assert trace["displayTimeUnit"] == "ms"
+    return trace["traceEvents"]
+
+
+def assert_balanced(events):
+    """Complete events on each thread nest: a span ends inside any span it starts in"""
+    by_thread = defaultdict(list)
+    for event in events:
+        if event["ph"] == "X":
+            by_thread[(event["pid"], event["tid"])].append(event)
+    for spans in by_thread.values():
+        open_spans = []
+        for event in sorted(spans, key=lambda e: (e["ts"], -e["dur"])):
+            while open_spans and event["ts"] >= open_spans[-1]["ts"] + open_spans[-1]["dur"] - EPSILON_US:
+                open_spans.pop()
+            if open_spans:
+                parent = open_spans[-1]
+                assert event["ts"] + event["dur"] <= parent["ts"] + parent["dur"] + EPSILON_US, \
+                    f"{event['name']} overlaps the end of {parent['name']}"
+            open_spans.append(event)
+
+
+def enclosed(events, outer):
+    return [e["name"] for e in events if e["ph"] == "X" and e["tid"] == outer["tid"] and e is not outer
+            and outer["ts"] <= e["ts"] and e["ts"] + e["dur"] <= outer["ts"] + outer["dur"] + EPSILON_US]
+
+
+def test_session_trace_is_valid_with_balanced_spans(make_debugger, fake, tmp_path):
+    debugger = make_debugger()
+    path = str(tmp_path / "trace.json")
+    tracer = debugger.start_trace(path)
+    report = debugger.analyze_webapp("http://app/")
+    os.remove(f"/tmp/debug_{report['session_id']}_initial.png")
+    assert debugger.stop_trace() == path
+    assert debugger.stop_trace() is None
+
+    events = load_trace(path)
+    assert len(events) == tracer.events_written
+    for event in events:
+        assert event["ph"] in ("M", "X", "i")
+        assert {"name", "pid", "tid"} <= set(event)
+        if event["ph"] == "X":
+            assert event["ts"] >= 0 and event["dur"] >= 0
+
+    metadata = [e for e in events if e["ph"] == "M"]
+    assert metadata[0]["name"] == "process_name"
+    named = {e["tid"] for e in metadata if e["name"] == "thread_name"}
+    assert {e["tid"] for e in events if e["ph"] != "M"} <= named
+    assert_balanced(events)
+
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert spans["Page.navigate"]["cat"] == "cdp"
+    assert {"bytes_out", "bytes_in", "error", "wire_ms"} <= set(spans["Page.navigate"]["args"])
+    assert "Page.navigate" in enclosed(events, spans["start_debug_session"])
+    assert "Page.captureScreenshot" in enclosed(events, spans["screenshot capture"])
+    assert {"decode_ms", "write_ms"} <= set(spans["screenshot capture"]["args"])
+
+
+def test_traced_spans_nest_and_close_cleanly(tmp_path):
+    path = str(tmp_path / "spans.json")
+    tracer = mcp.ChromeTraceWriter(path, process_name="test")
+    with tracer.span("outer", "test", step=1) as args:
+        with tracer.span("inner", "test"):
+            tracer.instant("mark", "test")
+        args["done"] = True
+    tracer.close()
+    tracer.close()
+    tracer.complete("late", "test", 0, 0)  # Dropped once the file is closed
+
+    events = load_trace(path)
+    assert [e["name"] for e in events] == ["process_name", "thread_name", "mark", "inner", "outer"]
+    assert events[-1]["args"] == {"step": 1, "done": True}
+    assert_balanced(events)
+    mark, inner, outer = events[2:]
+    assert enclosed(events, outer) == ["inner"]
+    assert inner["ts"] <= mark["ts"] <= inner["ts"] + inner["dur"]
@@ -0,0 +1,46 @@
+"""The debugger over every CDP transport against FakeCDPServer"""
+
+import time
+
+import pytest
+
+from conftest import TRANSPORTS, mcp
+
+
+def _tab(debugger, session_id):
+    return debugger.sessions[session_id].tab_id
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_session_start_loads_page(make_debugger, fake, transport):
+    debugger = make_debugger(transport)
+    session_id = debugger.start_debug_session("http://app/")
+    started = next(event for event in debugger.sessions[session_id].events if event.event_type == "session_started")
+    assert started.data["load"]["success"]
+    assert fake.targets[_tab(debugger, session_id)]["url"] == "http://app/"
+
+
+def test_command_timeout_keeps_the_connection_and_its_monitors(make_debugger, fake):
+    fake.navigation_requests = [{"url": "http://app/api/workouts"}]
+    debugger = make_debugger("websocket")
+    session_id = debugger.start_debug_session("http://app/")
+    session, tab_id = debugger.sessions[session_id], _tab(debugger, session_id)
+    fake.evaluate("slow()", lambda params, target_id: time.sleep(0.5) or 1)
+
+    debugger.command_timeout = 0.1
+    assert "timed out" in debugger._execute_javascript(tab_id, "slow()")["error"]
+    debugger.command_timeout = 30.0
+
+    mark = debugger._navigation_mark(tab_id)
+    debugger._send_devtools_command(tab_id, "Page.navigate", {"url": "http://app/again"})
+    assert debugger.wait_for_navigation(tab_id, since=mark, timeout=5)["success"]
+    assert session.network_stats["finished"] == 2
+
+
+def test_incomplete_transport_fails_at_construction():
+    class HTTPOnly(mcp.CDPTransport):
+        def http(self, method, endpoint, body=None):
+            return {}
+
+    with pytest.raises(TypeError):
+        HTTPOnly("http://127.0.0.1:9222")
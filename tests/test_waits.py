@@ -0,0 +1,27 @@
+"""Event-driven navigation waits"""
+
+import time
+
+import pytest
+
+from conftest import TRANSPORTS
+
+
+def _tab(debugger, session_id):
+    return debugger.sessions[session_id].tab_id
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_wait_for_navigation_ignores_loads_before_the_mark(make_debugger, transport):
+    debugger = make_debugger(transport)
+    session_id = debugger.start_debug_session("http://app/")
+    tab_id = _tab(debugger, session_id)
+
+    started = time.perf_counter()
+    waited = debugger.wait_for_navigation(tab_id, since=debugger._navigation_mark(tab_id), timeout=0.3)
+    assert not waited["success"]
+    assert time.perf_counter() - started >= 0.25
+
+    mark = debugger._navigation_mark(tab_id)
+    debugger._send_devtools_command(tab_id, "Page.navigate", {"url": "http://app/next"})
+    assert debugger.wait_for_navigation(tab_id, since=mark, timeout=5)["success"]
@@ -0,0 +1,102 @@
+"""WebSocket framing and the CDPWebSocket client"""
+
+import io
+import threading
+
+import pytest
+
+from conftest import mcp
+
+
+def test_accept_key_matches_rfc_example():
+    # RFC 6455 section 1.3
+    assert mcp._ws_accept_key("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+
+
+@pytest.mark.parametrize("size", [0, 1, 125, 126, 65535, 65536, 70001])
+@pytest.mark.parametrize("mask", [True, False])
+def test_frame_round_trip(size, mask):
+    payload = bytes(index % 251 for index in range(size))
+    frame = mcp._encode_ws_frame(payload, mask=mask)
+    fin, opcode, decoded = mcp._read_ws_frame(io.BytesIO(frame))
+    assert (fin, opcode, decoded) == (True, mcp.WS_OP_TEXT, payload)
+
+
+def test_masked_frame_hides_payload():
+    frame = mcp._encode_ws_frame(b"x" * 64, mask=True)
+    assert frame[1] & 0x80
+    assert b"x" * 64 not in frame
+
+
+def test_truncated_frame_raises():
+    frame = mcp._encode_ws_frame(b"hello world", mask=False)
+    with pytest.raises(mcp.CDPConnectionError):
+        mcp._read_ws_frame(io.BytesIO(frame[:-3]))
+
+
+def _page_ws_url(fake):
+    target = fake.add_target("http://app/")
+    return target["id"], f"ws://127.0.0.1:{fake.port}/devtools/page/{target['id']}"
+
+
+def test_commands_are_matched_to_replies_concurrently(fake):
+    _, ws_url = _page_ws_url(fake)
+    fake.respond("Custom.echo", lambda params, target_id: {"value": params["n"]})
+    connection = mcp.CDPWebSocket(ws_url)
+    try:
+        results = {}
+
+        def call(n):
+            results[n] = connection.send_command("Custom.echo", {"n": n})["result"]["value"]
+
+        threads = [threading.Thread(target=call, args=(n,)) for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {n: n for n in range(20)}
+    finally:
+        connection.close()
+
+
+def test_events_reach_listeners(fake):
+    target_id, ws_url = _page_ws_url(fake)
+    connection = mcp.CDPWebSocket(ws_url)
+    received = threading.Event()
+    seen = []
+    try:
+        def on_event(params):
+            seen.append(params)
+            received.set()
+
+        connection.on("Custom.happened", on_event)
+        connection.send_command("Page.enable")
+        fake.emit(target_id, "Custom.happened", {"n": 1})
+        assert received.wait(2)
+        assert seen == [{"n": 1}]
+    finally:
+        connection.close()
+
+
+def test_protocol_error_is_returned(fake):
+    _, ws_url = _page_ws_url(fake)
+    fake.respond("Custom.fail", error="boom")
+    connection = mcp.CDPWebSocket(ws_url)
+    try:
+        assert "error" in connection.send_command("Custom.fail")
+    finally:
+        connection.close()
+
+
+def test_lost_connection_fails_commands(fake):
+    _, ws_url = _page_ws_url(fake)
+    connection = mcp.CDPWebSocket(ws_url)
+    fake.close()
+    with pytest.raises(mcp.CDPConnectionError):
+        connection.send_command("Page.enable", timeout=2)
+    connection.close()
+
+
+def test_unreachable_endpoint_raises():
+    with pytest.raises(mcp.CDPConnectionError):
+        mcp.CDPWebSocket("ws://127.0.0.1:1/devtools/page/x", connect_timeout=1)